@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Event, Category, UserEventInteraction
+from .models import Event, Category, UserEventInteraction, MapCluster
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -22,4 +22,11 @@ class EventAdmin(admin.ModelAdmin):
 class UserEventInteractionAdmin(admin.ModelAdmin):
     list_display = ['user', 'event', 'interaction_type', 'created_at']
     list_filter = ['interaction_type', 'created_at']
-    search_fields = ['user__username', 'event__title']
\ No newline at end of file
+    search_fields = ['user__username', 'event__title']
+
+
+@admin.register(MapCluster)
+class MapClusterAdmin(admin.ModelAdmin):
+    list_display = ['cell', 'precision', 'count']
+    list_filter = ['precision']
+    search_fields = ['cell']
\ No newline at end of file
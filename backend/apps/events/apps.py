@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.events'
-    verbose_name = 'Мероприятия'
\ No newline at end of file
+    verbose_name = 'Мероприятия'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Кэш ответов списков мероприятий для анонимных пользователей
+
+Ключ строится из нормализованной строки запроса, текущей даты и номера
+версии. Любое изменение мероприятия, категории или одобренного отзыва
+увеличивает версию, после чего старые записи больше не читаются и
+истекают сами.
+"""
+import hashlib
+import time
+from datetime import datetime, time as dt_time, timedelta
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from utils.metrics import record_cache
+
+VERSION_KEY = 'events:list:version'
+CATEGORY_VERSION_KEY = 'events:categories:version'
+STATS_KEY = 'events:list:stats:{}'
+
+LOCK_TIMEOUT = 10
+LOCK_WAIT_STEP = 0.05
+LOCK_WAIT_ATTEMPTS = 40
+
+
+def get_version(key=VERSION_KEY):
+    """Текущая версия данных (по умолчанию — списков мероприятий)"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def invalidate(key=VERSION_KEY):
+    """Увеличивает версию данных после фиксации текущей транзакции"""
+    transaction.on_commit(lambda: _bump_version(key))
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def _increment_stat(name):
+    key = STATS_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def get_stats():
+    """Счетчики попаданий и промахов кэша"""
+    return {
+        name: cache.get(STATS_KEY.format(name), 0)
+        for name in ('hits', 'misses')
+    }
+
+
+def seconds_until_midnight():
+    """
+    Время до смены дня: списки зависят от текущей даты (только будущие события).
+    День считается так же, как в EventViewSet.get_queryset (timezone.now().date()).
+    """
+    now = timezone.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), dt_time.min, tzinfo=now.tzinfo)
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+def build_key(request, action, version_key=VERSION_KEY):
+    """Ключ по нормализованной строке запроса (порядок и пустые параметры не важны)"""
+    params = []
+    for name in sorted(request.query_params):
+        values = sorted(value for value in request.query_params.getlist(name))
+        if name == 'page' and values == ['1']:
+            continue
+        if name != 'cursor':
+            values = [value for value in values if value]
+        params.extend((name, value) for value in values)
+
+    raw = f'{request.get_host()}?{urlencode(params)}'
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    today = timezone.now().date().isoformat()
+    return f'events:{action}:v{get_version(version_key)}:{today}:{digest}'
+
+
+def get_or_compute(request, action, compute, version_key=VERSION_KEY):
+    """
+    Возвращает закэшированные данные ответа или вычисляет их
+
+    version_key — ключ версии данных, при изменении которой запись
+    устаревает (по умолчанию — общая версия списков мероприятий).
+
+    Одновременно пересчет выполняет только один процесс (блокировка
+    через cache.add), остальные ждут появления результата, чтобы
+    истечение популярного ключа не приводило к лавине одинаковых запросов.
+    """
+    key = build_key(request, action, version_key)
+    data = cache.get(key)
+    if data is not None:
+        _increment_stat('hits')
+        record_cache('hit')
+        return data
+
+    _increment_stat('misses')
+    record_cache('miss')
+    lock_key = f'{key}:lock'
+    locked = cache.add(lock_key, 1, timeout=LOCK_TIMEOUT)
+    if not locked:
+        for _ in range(LOCK_WAIT_ATTEMPTS):
+            time.sleep(LOCK_WAIT_STEP)
+            data = cache.get(key)
+            if data is not None:
+                return data
+
+    try:
+        data = _detach(compute())
+        timeout = min(settings.EVENT_LIST_CACHE_TIMEOUT, seconds_until_midnight())
+        cache.set(key, data, timeout=timeout)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return data
+
+
+def _detach(data):
+    """Отвязывает ReturnList/ReturnDict от сериализатора, чтобы данные можно было сохранить"""
+    if isinstance(data, list):
+        return list(data)
+    if isinstance(data, dict):
+        return {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in data.items()
+        }
+    return data
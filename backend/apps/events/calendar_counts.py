@@ -0,0 +1,87 @@
+"""
+Число мероприятий по дням месяца для календаря
+
+Многодневное мероприятие (с end_date) учитывается в каждом дне, который
+оно охватывает в пределах месяца. Дни разворачиваются в базе
+(generate_series), счет — одним сгруппированным запросом; отбор
+мероприятий ограничен диапазоном start_date, поэтому для будущих месяцев
+идет по частичному индексу (start_date, city).
+
+Кэш версионируется по месяцам: изменение мероприятия сбрасывает только
+месяцы, которые оно охватывало до и после изменения.
+"""
+import calendar
+from datetime import date, timedelta
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+from . import cache
+
+MONTH_VERSION_KEY = 'events:calendar:version:{}'
+
+# Самое длинное учитываемое мероприятие: нижняя граница start_date для индекса
+MAX_SPAN_DAYS = 366
+
+
+def parse_month(value):
+    """Первый и последний день месяца из строки YYYY-MM"""
+    try:
+        year, month = (int(part) for part in (value or '').split('-'))
+        first = date(year, month, 1)
+    except ValueError:
+        raise ValidationError({'month': 'Ожидается месяц в формате YYYY-MM'})
+    return first, first.replace(day=calendar.monthrange(year, month)[1])
+
+
+def version_key(first):
+    return MONTH_VERSION_KEY.format(first.strftime('%Y-%m'))
+
+
+def months_between(start_date, end_date):
+    """Первые дни месяцев, которые охватывает мероприятие"""
+    end_date = min(end_date or start_date, start_date + timedelta(days=MAX_SPAN_DAYS))
+    month = start_date.replace(day=1)
+    while month <= end_date:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def invalidate_span(start_date, end_date):
+    """Сбрасывает кэш календаря месяцев, которые охватывает мероприятие"""
+    for month in months_between(start_date, end_date):
+        cache.invalidate(version_key(month))
+
+
+def day_counts(queryset, first, last):
+    """
+    {дата ISO: число мероприятий} для дней с first по last
+
+    Args:
+        queryset: отфильтрованные мероприятия (фильтр по датам — здесь)
+    """
+    queryset = queryset.filter(
+        Q(end_date__gte=first) | Q(end_date__isnull=True, start_date__gte=first),
+        start_date__gte=first - timedelta(days=MAX_SPAN_DAYS),
+        start_date__lte=last,
+    ).annotate(
+        last_date=Coalesce('end_date', 'start_date')
+    ).order_by().values_list('start_date', 'last_date')
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT day::date, COUNT(*) '
+            f'FROM ({sql}) AS e(start_date, last_date) '
+            'CROSS JOIN LATERAL generate_series('
+            'GREATEST(e.start_date, %s::date), LEAST(e.last_date, %s::date), '
+            "interval '1 day') AS day "
+            'GROUP BY 1',
+            [*params, first, last]
+        )
+        counts = dict(cursor.fetchall())
+
+    return {
+        day.isoformat(): counts.get(day, 0)
+        for day in (first + timedelta(days=offset) for offset in range((last - first).days + 1))
+    }
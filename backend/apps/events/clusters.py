@@ -0,0 +1,205 @@
+"""
+Пирамида кластеров мероприятий для карты
+
+Для каждого уровня точности geohash хранится число мероприятий в ячейке,
+сумма координат (для центроида) и распределение по категориям. Пирамида
+обновляется инкрементально при сохранении мероприятия и полностью
+пересобирается ночью (мероприятия перестают быть предстоящими).
+Кластеры кэшируются по плиткам (уровень и префикс geohash из покрытия
+области карты), поэтому запрос карты читает только видимые плитки и не
+обращается к таблице мероприятий.
+"""
+from collections import Counter, defaultdict
+from django.core.cache import cache as django_cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from utils.geo import geohash_cover
+from . import cache
+from .models import Category, Event, MapCluster
+
+CLUSTER_VERSION_KEY = 'events:clusters:version'
+CLUSTER_CACHE_TIMEOUT = 60 * 60 * 24
+
+PRECISIONS = range(1, 8)
+
+# Уровень масштаба карты (Leaflet, 0–18) -> длина префикса geohash
+ZOOM_PRECISION = {
+    0: 1, 1: 1, 2: 1,
+    3: 2, 4: 2,
+    5: 3, 6: 3, 7: 3,
+    8: 4, 9: 4,
+    10: 5, 11: 5, 12: 5,
+    13: 6, 14: 6,
+    15: 7, 16: 7, 17: 7, 18: 7,
+}
+
+
+def zoom_to_precision(zoom):
+    return ZOOM_PRECISION[min(max(int(zoom), 0), 18)]
+
+
+def event_contribution(geohash, latitude, longitude, category_id, status, start_date):
+    """Вклад мероприятия в пирамиду или None, если оно не показывается на карте"""
+    if (
+        not geohash
+        or latitude is None
+        or longitude is None
+        or status != 'published'
+        or start_date < timezone.now().date()
+    ):
+        return None
+    return geohash, float(latitude), float(longitude), category_id
+
+
+def snapshot(event_id):
+    """Текущий вклад сохраненного мероприятия (для вычисления разницы при изменении)"""
+    state = Event.objects.filter(pk=event_id).values(
+        'geohash', 'latitude', 'longitude', 'category_id', 'status', 'start_date'
+    ).first()
+    return event_contribution(**state) if state else None
+
+
+def apply_change(previous, current):
+    """Вычитает старый и добавляет новый вклад мероприятия во все уровни пирамиды"""
+    if previous == current:
+        return
+
+    with transaction.atomic():
+        if previous:
+            _apply(previous, -1)
+        if current:
+            _apply(current, 1)
+    cache.invalidate(CLUSTER_VERSION_KEY)
+
+
+def _apply(contribution, delta):
+    geohash, latitude, longitude, category_id = contribution
+    category_key = str(category_id)
+
+    for precision in PRECISIONS:
+        cell = geohash[:precision]
+        cluster, _ = MapCluster.objects.select_for_update().get_or_create(
+            precision=precision, cell=cell
+        )
+        counts = cluster.category_counts
+        counts[category_key] = counts.get(category_key, 0) + delta
+        if counts[category_key] <= 0:
+            del counts[category_key]
+
+        if cluster.count + delta <= 0:
+            cluster.delete()
+            continue
+
+        MapCluster.objects.filter(pk=cluster.pk).update(
+            count=F('count') + delta,
+            latitude_sum=F('latitude_sum') + delta * latitude,
+            longitude_sum=F('longitude_sum') + delta * longitude,
+            category_counts=counts,
+        )
+
+
+def rebuild():
+    """
+    Полная пересборка пирамиды по предстоящим опубликованным мероприятиям
+
+    Returns:
+        количество кластеров
+    """
+    counts = defaultdict(int)
+    latitude_sums = defaultdict(float)
+    longitude_sums = defaultdict(float)
+    categories = defaultdict(Counter)
+
+    events = Event.objects.filter(
+        status='published',
+        start_date__gte=timezone.now().date(),
+        latitude__isnull=False,
+        longitude__isnull=False,
+    ).exclude(geohash='').values_list('geohash', 'latitude', 'longitude', 'category_id')
+
+    for geohash, latitude, longitude, category_id in events.iterator(chunk_size=5000):
+        latitude, longitude = float(latitude), float(longitude)
+        for precision in PRECISIONS:
+            key = (precision, geohash[:precision])
+            counts[key] += 1
+            latitude_sums[key] += latitude
+            longitude_sums[key] += longitude
+            categories[key][str(category_id)] += 1
+
+    clusters = [
+        MapCluster(
+            precision=precision,
+            cell=cell,
+            count=count,
+            latitude_sum=latitude_sums[(precision, cell)],
+            longitude_sum=longitude_sums[(precision, cell)],
+            category_counts=dict(categories[(precision, cell)]),
+        )
+        for (precision, cell), count in counts.items()
+    ]
+
+    with transaction.atomic():
+        MapCluster.objects.all().delete()
+        MapCluster.objects.bulk_create(clusters, batch_size=1000)
+    cache.invalidate(CLUSTER_VERSION_KEY)
+    return len(clusters)
+
+
+def get_tiles(precision, prefixes):
+    """
+    Кластеры уровня в ячейках, начинающихся с префиксов (каждый префикс — из кэша)
+
+    Returns:
+        список [cell, count, latitude, longitude, category_id, category_name]
+    """
+    version = cache.get_version(CLUSTER_VERSION_KEY)
+    keys = {prefix: f'events:clusters:v{version}:{precision}:{prefix}' for prefix in prefixes}
+    cached = django_cache.get_many(keys.values())
+    tiles = {prefix: cached[key] for prefix, key in keys.items() if key in cached}
+
+    missing = [prefix for prefix in prefixes if prefix not in tiles]
+    if missing:
+        cells = Q()
+        for prefix in missing:
+            cells |= Q(cell__startswith=prefix)
+        category_names = dict(Category.objects.values_list('id', 'name'))
+        for prefix in missing:
+            tiles[prefix] = []
+
+        for cluster in MapCluster.objects.filter(cells, precision=precision).iterator(chunk_size=5000):
+            dominant = max(cluster.category_counts.items(), key=lambda item: item[1], default=(None, 0))[0]
+            category_id = int(dominant) if dominant not in (None, 'None') else None
+            # Префиксы покрытия не вложены друг в друга: ячейка попадает ровно в один
+            prefix = next(prefix for prefix in missing if cluster.cell.startswith(prefix))
+            tiles[prefix].append([
+                cluster.cell,
+                cluster.count,
+                round(cluster.latitude_sum / cluster.count, 6),
+                round(cluster.longitude_sum / cluster.count, 6),
+                category_id,
+                category_names.get(category_id),
+            ])
+        django_cache.set_many(
+            {keys[prefix]: tiles[prefix] for prefix in missing}, timeout=CLUSTER_CACHE_TIMEOUT
+        )
+
+    return [cluster for prefix in prefixes for cluster in tiles[prefix]]
+
+
+def get_clusters(zoom, min_lat, min_lon, max_lat, max_lon):
+    """
+    Кластеры уровня масштаба, центроиды которых попадают в область карты
+
+    Область покрывается префиксами geohash (не длиннее ячеек уровня), и
+    читаются только кластеры этих префиксов; центроид кластера лежит внутри
+    его ячейки, поэтому за пределами покрытия подходящих кластеров нет.
+    """
+    precision = zoom_to_precision(zoom)
+    prefixes = sorted({
+        prefix[:precision] for prefix in geohash_cover(min_lat, min_lon, max_lat, max_lon)
+    })
+    return [
+        cluster for cluster in get_tiles(precision, prefixes)
+        if min_lat <= cluster[2] <= max_lat and min_lon <= cluster[3] <= max_lon
+    ]
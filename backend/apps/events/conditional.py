@@ -0,0 +1,81 @@
+"""
+Валидаторы кэша (ETag, Last-Modified, Cache-Control) для детальной
+страницы мероприятия и категорий
+
+Валидатор вычисляется легким запросом без сериализации; если он совпал
+с присланным клиентом, возвращается 304 без тела ответа. Формат ответа
+(JSON или MessagePack по Accept) входит в ETag и в Vary.
+"""
+import hashlib
+from django.utils.http import http_date
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers, quote_etag
+)
+from . import cache
+from .models import UserEventInteraction
+
+
+def _etag(request, *parts):
+    """ETag по частям состояния и формату, выбранному согласованием содержимого"""
+    renderer = getattr(request, 'accepted_renderer', None)
+    raw = ':'.join(str(part) for part in (getattr(renderer, 'format', ''), *parts))
+    return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+
+
+def event_validators(queryset, request):
+    """
+    ETag и Last-Modified мероприятия по updated_at и агрегатам отзывов
+
+    Для авторизованного пользователя в ETag входят его отметки
+    (user_interaction), а Last-Modified не отдается: отметки не меняют
+    updated_at мероприятия.
+
+    Returns:
+        (pk, etag, last_modified) или None, если мероприятие не найдено
+    """
+    state = queryset.values('pk', 'updated_at', 'reviews_count', 'rating_sum').first()
+    if state is None:
+        return None
+
+    if not request.user.is_authenticated:
+        etag = _etag(request, state['pk'], state['updated_at'].isoformat(),
+                     state['reviews_count'], state['rating_sum'])
+        return state['pk'], etag, state['updated_at']
+
+    interactions = sorted(UserEventInteraction.objects.filter(
+        user=request.user, event_id=state['pk']
+    ).values_list('interaction_type', flat=True))
+    etag = _etag(request, state['pk'], state['updated_at'].isoformat(),
+                 state['reviews_count'], state['rating_sum'],
+                 request.user.pk, *interactions)
+    return state['pk'], etag, None
+
+
+def category_etag(request, slug=None):
+    """ETag списка категорий или отдельной категории по версии данных категорий"""
+    return _etag(request, 'categories', cache.get_version(cache.CATEGORY_VERSION_KEY), slug or '')
+
+
+def not_modified(request, etag, last_modified=None):
+    """Ответ 304, если валидаторы клиента совпадают, иначе None"""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, request, etag, last_modified=None, max_age=0):
+    """
+    Проставляет ETag, Last-Modified и Cache-Control
+
+    Ответы авторизованным пользователям помечаются как private, чтобы
+    общий кэш (nginx) не отдал их другому пользователю; Vary: Accept —
+    чтобы не отдал MessagePack клиенту, ожидающему JSON.
+    """
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=max_age)
+    patch_vary_headers(response, ('Accept', 'Authorization', 'Cookie'))
+    return response
@@ -0,0 +1,167 @@
+"""
+Буферизованный счетчик просмотров мероприятий
+
+Просмотры накапливаются в хэше Redis и периодически переносятся в БД
+одним UPDATE задачей flush_event_views. При чтении к значению из БД
+добавляется еще не перенесенная разница, поэтому счетчик не убывает.
+
+Каждый перенос применяется к БД ровно один раз: идентификатор буфера
+сохраняется в CounterFlush в одной транзакции с UPDATE. Буфер удаляется из
+Redis сразу после фиксации транзакции; если процесс упал между фиксацией и
+удалением, до следующего переноса он еще добавляется к показываемым
+значениям, но в БД повторно не попадает.
+"""
+import uuid
+import redis
+from django.conf import settings
+from django.db import connection, transaction
+from .models import CounterFlush, Event
+
+PENDING_VIEWS_KEY = 'events:views:pending'
+FLUSHING_VIEWS_KEY = 'events:views:flushing'
+FLUSH_ID_KEY = 'events:views:flush_id'
+
+_redis_client = None
+
+
+def get_redis():
+    """Возвращает клиент Redis (создается один раз на процесс)"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+def record_view(event):
+    """Учитывает просмотр мероприятия (и активность для рейтинга популярности)"""
+    from . import trending
+
+    if settings.EVENT_VIEWS_BUFFERED:
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hincrby(PENDING_VIEWS_KEY, event.pk, 1)
+            trending.record_many({event.pk: trending.WEIGHTS['view']}, pipe)
+            pipe.execute()
+            return
+        except redis.RedisError:
+            pass  # Redis недоступен — пишем напрямую в БД
+    event.increment_views()
+    trending.record(event.pk, 'view')
+
+
+def get_pending_views(event_ids):
+    """Возвращает {event_id: количество еще не перенесенных просмотров}"""
+    event_ids = list(event_ids)
+    if not settings.EVENT_VIEWS_BUFFERED or not event_ids:
+        return {}
+
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hmget(PENDING_VIEWS_KEY, event_ids)
+        pipe.hmget(FLUSHING_VIEWS_KEY, event_ids)
+        pending, flushing = pipe.execute()
+    except redis.RedisError:
+        return {}
+
+    result = {}
+    for event_id, pending_value, flushing_value in zip(event_ids, pending, flushing):
+        delta = int(pending_value or 0) + int(flushing_value or 0)
+        if delta:
+            result[event_id] = delta
+    return result
+
+
+def merge_pending_views(events):
+    """
+    Добавляет к views_count мероприятий еще не перенесенные в БД просмотры
+    (мероприятия, загруженные без views_count, пропускаются)
+    """
+    events = list(events)
+    loaded = [event for event in events if 'views_count' not in event.get_deferred_fields()]
+    pending = get_pending_views(event.pk for event in loaded)
+    for event in loaded:
+        event.views_count += pending.get(event.pk, 0)
+    return events
+
+
+def claim_buffer(client, pending_key, flushing_key, flush_id_key):
+    """
+    Забирает буфер Redis на перенос
+
+    Хэш атомарно (MULTI) переименовывается вместе с записью идентификатора
+    переноса, поэтому новые значения во время переноса попадают в новый
+    буфер. Если предыдущий перенос прервался, возвращается его буфер.
+
+    Returns:
+        идентификатор переноса или None, если буфер пуст
+    """
+    if not client.exists(flushing_key):
+        pipe = client.pipeline()
+        pipe.rename(pending_key, flushing_key)
+        pipe.set(flush_id_key, uuid.uuid4().hex)
+        try:
+            pipe.execute()
+        except redis.ResponseError:
+            return None
+
+    flush_id = client.get(flush_id_key)
+    if flush_id is None:
+        # Буфер без идентификатора (прерванный перенос до его появления)
+        flush_id = uuid.uuid4().hex.encode()
+        client.set(flush_id_key, flush_id)
+    return flush_id.decode()
+
+
+def mark_flushed(key, flush_id):
+    """
+    Отмечает перенос буфера key в текущей транзакции
+
+    Строка CounterFlush блокируется до конца транзакции, поэтому
+    параллельные переносы одного буфера выполняются по очереди.
+
+    Returns:
+        False, если перенос с этим идентификатором уже применен
+    """
+    marker, _ = CounterFlush.objects.select_for_update().get_or_create(key=key)
+    if marker.flush_id == flush_id:
+        return False
+    CounterFlush.objects.filter(pk=marker.pk).update(flush_id=flush_id)
+    return True
+
+
+def flush_views():
+    """
+    Переносит накопленные просмотры в БД одним UPDATE
+
+    Буфер забирается claim_buffer; оставшийся после сбоя буфер дописывается,
+    только если он еще не был применен (mark_flushed).
+
+    Returns:
+        количество обновленных мероприятий
+    """
+    client = get_redis()
+
+    flush_id = claim_buffer(client, PENDING_VIEWS_KEY, FLUSHING_VIEWS_KEY, FLUSH_ID_KEY)
+    if flush_id is None:
+        return 0  # Буфер пуст
+
+    deltas = [
+        (int(event_id), int(delta))
+        for event_id, delta in client.hgetall(FLUSHING_VIEWS_KEY).items()
+    ]
+
+    with transaction.atomic():
+        if not mark_flushed(FLUSHING_VIEWS_KEY, flush_id):
+            deltas = []  # Уже применен, осталось удалить буфер
+        elif deltas:
+            table = connection.ops.quote_name(Event._meta.db_table)
+            values = ', '.join(['(%s, %s)'] * len(deltas))
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} SET views_count = {table}.views_count + v.delta '
+                    f'FROM (VALUES {values}) AS v(id, delta) WHERE {table}.id = v.id',
+                    [value for pair in deltas for value in pair]
+                )
+        transaction.on_commit(lambda: client.delete(FLUSHING_VIEWS_KEY, FLUSH_ID_KEY))
+
+    return len(deltas)
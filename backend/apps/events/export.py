@@ -0,0 +1,37 @@
+"""
+Потоковая выгрузка мероприятий (NDJSON / CSV)
+
+Строки читаются серверным курсором (iterator(chunk_size=...)) и
+сериализуются пачками быстрым путем FastEventListSerializer, поэтому
+расход памяти не зависит от числа выгружаемых мероприятий. Формат строк
+совпадает с элементами списка /events/.
+"""
+from itertools import islice
+from .fastpath import FastEventListSerializer
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class EventExport:
+    """
+    Выгрузка мероприятий queryset в формате EventListSerializer
+
+    Пример:
+        export = EventExport(queryset, request)
+        for chunk in renderer.stream(export.rows(), export.fields):
+            ...
+    """
+
+    def __init__(self, queryset, request, chunk_size=EXPORT_CHUNK_SIZE):
+        self.serializer = FastEventListSerializer(queryset, request)
+        self.fields = self.serializer.field_names
+        self.chunk_size = chunk_size
+
+    def rows(self):
+        """Словари мероприятий по одному, с чтением из БД пачками chunk_size"""
+        rows = self.serializer.queryset.iterator(chunk_size=self.chunk_size)
+        while True:
+            batch = list(islice(rows, self.chunk_size))
+            if not batch:
+                return
+            yield from self.serializer.serialize(batch)
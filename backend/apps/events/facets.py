@@ -0,0 +1,129 @@
+"""
+Счетчики фасетов для панели фильтров
+
+Каждый фасет считается одним сгруппированным запросом с применением всех
+параметров EventFilter, кроме собственных: выбранная категория не
+обнуляет счетчики остальных категорий. Интервалы дат считаются одним
+запросом с условной агрегацией (интервалы пересекаются).
+"""
+from datetime import timedelta
+from django.db.models import Count, Q
+from django.utils import timezone
+from django_filters.utils import translate_validation
+from .filters import EventFilter
+from .models import Event
+
+# Фасет -> параметры EventFilter, которые при его подсчете не применяются
+FACET_PARAMS = {
+    'category': ('category',),
+    'age_restriction': ('age_restriction',),
+    'is_free': ('is_free',),
+    'city': ('city',),
+    'date': ('start_date_from', 'start_date_to'),
+}
+
+# Городов в ответе (самые частые)
+CITY_LIMIT = 50
+
+IS_FREE_LABELS = {True: 'Бесплатные', False: 'Платные'}
+
+
+def date_buckets(today=None):
+    """
+    Интервалы дат: (значение, название, дата от, дата до);
+    «выходные» — ближайшие суббота и воскресенье (текущие, если сегодня выходной)
+    """
+    today = today or timezone.now().date()
+    saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+    if today.weekday() == 6:
+        saturday = today - timedelta(days=1)
+    return [
+        ('today', 'Сегодня', today, today),
+        ('tomorrow', 'Завтра', today + timedelta(days=1), today + timedelta(days=1)),
+        ('weekend', 'Выходные', max(saturday, today), saturday + timedelta(days=1)),
+        ('week', 'Ближайшие 7 дней', today, today + timedelta(days=6)),
+        ('month', 'Ближайшие 30 дней', today, today + timedelta(days=29)),
+    ]
+
+
+class EventFacets:
+    """
+    Счетчики фасетов для queryset мероприятий и параметров запроса
+
+    Пример:
+        data = EventFacets(view.get_queryset(), request).counts()
+
+    Args:
+        queryset: мероприятия до применения EventFilter
+        request: запрос с параметрами EventFilter
+    """
+
+    filterset_class = EventFilter
+
+    def __init__(self, queryset, request):
+        self.queryset = queryset.order_by()
+        self.request = request
+        self.params = request.query_params
+
+    def counts(self):
+        """Общее число мероприятий и счетчики всех фасетов"""
+        result = {'total': self.filtered().count()}
+        for facet in FACET_PARAMS:
+            result[facet] = getattr(self, f'count_{facet}')(self.filtered(exclude=FACET_PARAMS[facet]))
+        return result
+
+    def filtered(self, exclude=()):
+        """queryset с параметрами EventFilter, кроме exclude"""
+        params = self.params.copy()
+        for name in exclude:
+            params.pop(name, None)
+        filterset = self.filterset_class(params, queryset=self.queryset, request=self.request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return filterset.qs
+
+    def count_category(self, queryset):
+        rows = queryset.filter(category__isnull=False).values(
+            'category__slug', 'category__name'
+        ).annotate(count=Count('id')).order_by('-count', 'category__name')
+        return [
+            {'value': row['category__slug'], 'label': row['category__name'], 'count': row['count']}
+            for row in rows
+        ]
+
+    def count_age_restriction(self, queryset):
+        counts = dict(queryset.values_list('age_restriction').annotate(count=Count('id')))
+        return [
+            {'value': value, 'label': label, 'count': counts[value]}
+            for value, label in Event.AGE_CHOICES if counts.get(value)
+        ]
+
+    def count_is_free(self, queryset):
+        counts = dict(queryset.values_list('is_free').annotate(count=Count('id')))
+        return [
+            {'value': value, 'label': IS_FREE_LABELS[value], 'count': counts[value]}
+            for value in (True, False) if counts.get(value)
+        ]
+
+    def count_city(self, queryset):
+        rows = queryset.exclude(city='').values('city').annotate(
+            count=Count('id')
+        ).order_by('-count', 'city')[:CITY_LIMIT]
+        return [{'value': row['city'], 'label': row['city'], 'count': row['count']} for row in rows]
+
+    def count_date(self, queryset):
+        buckets = date_buckets()
+        counts = queryset.aggregate(**{
+            value: Count('id', filter=Q(start_date__gte=date_from, start_date__lte=date_to))
+            for value, label, date_from, date_to in buckets
+        })
+        return [
+            {
+                'value': value,
+                'label': label,
+                'start_date_from': date_from.isoformat(),
+                'start_date_to': date_to.isoformat(),
+                'count': counts[value],
+            }
+            for value, label, date_from, date_to in buckets
+        ]
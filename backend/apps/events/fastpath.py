@@ -0,0 +1,196 @@
+"""
+Быстрая сериализация списка мероприятий без создания моделей
+
+Строки читаются через values() (название категории — тем же запросом) и
+превращаются в словари заранее подобранными конвертерами полей. Набор и
+порядок полей берутся из EventListSerializer (с учетом ?fields= / ?omit=),
+значения совпадают с ним байт в байт — это проверяют тесты
+apps.events.tests.test_fastpath и команда check_list_parity (на реальных
+данных).
+"""
+from operator import itemgetter
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from .counters import get_pending_views
+from .models import UserEventInteraction
+from .serializers import EventListSerializer
+
+# Поля, значение которых DRF отдает без преобразования
+IDENTITY_FIELD_TYPES = (
+    serializers.CharField, serializers.SlugField, serializers.EmailField,
+    serializers.URLField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ChoiceField, serializers.ReadOnlyField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _average_rating(row):
+    """То же, что Event.get_average_rating"""
+    if not row['reviews_count']:
+        return 0
+    return round(row['rating_sum'] / row['reviews_count'], 1)
+
+
+def _none(row):
+    return None
+
+
+# Значение-признак: поле не попадает в ответ
+SKIP = object()
+
+
+class FastEventListSerializer:
+    """
+    Сериализатор списка мероприятий по строкам values()
+
+    Пример:
+        fast = FastEventListSerializer(queryset, request)
+        data = fast.serialize(fast.queryset[:100])
+
+    Args:
+        queryset: отфильтрованный и отсортированный queryset мероприятий
+        request: запрос (для ?fields= / ?omit= и абсолютных URL изображений)
+        extra_fields: колонки, которые нужны вне сериализатора
+            (например, поля keyset-пагинации)
+    """
+
+    serializer_class = EventListSerializer
+
+    # Поля, вычисляемые методами модели: (колонки, функция от строки)
+    computed_fields = {
+        'average_rating': (('reviews_count', 'rating_sum'), _average_rating),
+    }
+
+    # Поля-аннотации запроса: берутся как есть, если аннотация есть, иначе None
+    annotation_fields = ('search_headline',)
+
+    # Отметки текущего пользователя: одним запросом на пачку строк
+    interaction_field = 'user_interaction'
+
+    def __init__(self, queryset, request, extra_fields=()):
+        self.request = request
+        self.model = queryset.model
+
+        serializer = self.serializer_class(context={'request': request})
+        annotations = queryset.query.annotations
+        columns = {'id'}
+        columns.update(field.lstrip('-') for field in extra_fields)
+
+        self.plan = [
+            (name, self._compile(name, field, annotations, columns))
+            for name, field in serializer.fields.items()
+        ]
+        self.merge_views = 'views_count' in serializer.fields
+        self.resolve_interactions = (
+            self.interaction_field in serializer.fields
+            and request is not None and request.user.is_authenticated
+        )
+        self.user_interactions = {}
+        self.queryset = queryset.values(*columns)
+
+    @property
+    def field_names(self):
+        """Имена полей ответа в порядке EventListSerializer"""
+        return [name for name, getter in self.plan]
+
+    def serialize(self, rows):
+        """Список словарей в формате EventListSerializer"""
+        rows = list(rows)
+        pending = get_pending_views(row['id'] for row in rows) if self.merge_views else {}
+        if self.resolve_interactions:
+            self.user_interactions = UserEventInteraction.get_user_map(
+                self.request.user, [row['id'] for row in rows]
+            )
+        plan = self.plan
+
+        results = []
+        for row in rows:
+            if pending:
+                row['views_count'] += pending.get(row['id'], 0)
+            item = {}
+            for name, getter in plan:
+                value = getter(row)
+                if value is not SKIP:
+                    item[name] = value
+            results.append(item)
+        return results
+
+    def _compile(self, name, field, annotations, columns):
+        """Функция, извлекающая значение поля из строки values()"""
+        if name in self.computed_fields:
+            dependencies, compute = self.computed_fields[name]
+            columns.update(dependencies)
+            return compute
+
+        if name == self.interaction_field:
+            return lambda row: self.user_interactions.get(row['id'], [])
+
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in self.annotation_fields:
+                raise ImproperlyConfigured(
+                    f'Поле {name} не поддерживается быстрой сериализацией'
+                )
+            if name not in annotations:
+                return _none
+            columns.add(name)
+            return itemgetter(name)
+
+        column = field.source.replace('.', '__')
+        columns.add(column)
+        convert = self._converter(field)
+
+        if '.' in field.source:
+            # DRF пропускает поле только для чтения, если связь пуста
+            relation = field.source.split('.', 1)[0]
+            columns.add(relation)
+
+            def getter(row):
+                if row[relation] is None:
+                    return SKIP
+                value = row[column]
+                return value if value is None or convert is None else convert(value)
+            return getter
+
+        if convert is None:
+            return itemgetter(column)
+
+        def getter(row):
+            value = row[column]
+            return None if value is None else convert(value)
+        return getter
+
+    def _converter(self, field):
+        """Конвертер значения колонки (None — значение отдается как есть)"""
+        if type(field) in IDENTITY_FIELD_TYPES:
+            return None
+
+        if isinstance(field, serializers.FileField):
+            return self._file_converter(field)
+
+        if isinstance(field, (serializers.DateField, serializers.TimeField)):
+            default = (
+                api_settings.DATE_FORMAT if isinstance(field, serializers.DateField)
+                else api_settings.TIME_FORMAT
+            )
+            output_format = getattr(field, 'format', default)
+            if output_format and output_format.lower() == 'iso-8601':
+                return lambda value: value.isoformat()
+
+        # Остальные поля (Decimal и др.) — штатным методом поля DRF
+        return field.to_representation
+
+    def _file_converter(self, field):
+        """URL файла по имени из БД так же, как FieldFile.url + build_absolute_uri"""
+        use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+        storage = self.model._meta.get_field(field.source).storage
+        build_absolute_uri = self.request.build_absolute_uri if self.request else None
+
+        def convert(name):
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            return build_absolute_uri(url) if build_absolute_uri else url
+        return convert
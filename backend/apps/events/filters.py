@@ -1,6 +1,18 @@
+import math
 import django_filters
+from django.contrib.postgres.search import (
+    SearchHeadline, SearchQuery, SearchRank, TrigramWordSimilarity
+)
+from django.db.models import F, Q
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from utils.geo import distance_km_expression, geohash_cover, radius_bbox
 from .models import Event
 
+# Допустимый модуль широты и долготы
+COORDINATE_LIMITS = {'lat': 90.0, 'lon': 180.0}
+
+
 class EventFilter(django_filters.FilterSet):
     """Фильтры для мероприятий согласно ТЗ (п. 2.1.2.2)"""
     
@@ -32,18 +44,147 @@ class EventFilter(django_filters.FilterSet):
     # Рекомендуемые
     is_featured = django_filters.BooleanFilter(label='Рекомендуемое')
     
+    # Геофильтры для карты
+    bbox = django_filters.CharFilter(
+        method='bbox_filter', label='Область карты (min_lon,min_lat,max_lon,max_lat)'
+    )
+    near = django_filters.CharFilter(method='near_filter', label='Рядом с точкой (lat,lon)')
+    radius_km = django_filters.NumberFilter(method='radius_filter', label='Радиус поиска, км')
+    
+    DEFAULT_RADIUS_KM = 5
+    MAX_RADIUS_KM = 100
+    
     class Meta:
         model = Event
         fields = [
             'search', 'start_date_from', 'start_date_to', 'category',
-            'city', 'is_free', 'age_restriction', 'organizer', 'is_featured'
+            'city', 'is_free', 'age_restriction', 'organizer', 'is_featured',
+            'bbox', 'near', 'radius_km'
         ]
     
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return self._search(queryset, self.form.cleaned_data.get('search') or '')
+    
     def search_filter(self, queryset, name, value):
-        """Комплексный поиск по нескольким полям"""
+        """Поиск применяется в filter_queryset после остальных фильтров"""
+        return queryset
+    
+    def _search(self, queryset, value):
+        """
+        Полнотекстовый поиск по названию, описанию, организатору, месту и городу
+        
+        Результаты ранжируются по релевантности (search_rank) и содержат
+        фрагмент описания с подсветкой (search_headline). Если среди
+        отфильтрованных мероприятий по словам ничего не найдено (например,
+        из-за опечатки), используется триграммный поиск по названию.
+        """
+        value = value.strip()
+        if not value:
+            return queryset
+        
+        query = SearchQuery(value, config='russian', search_type='websearch')
+        results = queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query),
+            search_headline=SearchHeadline(
+                'description',
+                query,
+                config='russian',
+                start_sel='<mark>',
+                stop_sel='</mark>',
+                max_words=35,
+                min_words=15,
+            ),
+        )
+        if results.exists():
+            return results
+        
+        return queryset.filter(title__trigram_word_similar=value).annotate(
+            search_rank=TrigramWordSimilarity(value, 'title'),
+            search_headline=F('short_description'),
+        )
+    
+    def bbox_filter(self, queryset, name, value):
+        """Мероприятия внутри прямоугольной области карты"""
+        min_lon, min_lat, max_lon, max_lat = self._parse_floats(name, value, ('lon', 'lat', 'lon', 'lat'))
+        if min_lat > max_lat or min_lon > max_lon:
+            raise ValidationError({name: 'Ожидается min_lon,min_lat,max_lon,max_lat'})
+        return self._filter_box(queryset, min_lat, min_lon, max_lat, max_lon)
+    
+    def near_filter(self, queryset, name, value):
+        """Мероприятия в радиусе radius_km от точки, с расстоянием (distance)"""
+        latitude, longitude = self._parse_floats(name, value, ('lat', 'lon'))
+        radius_km = self.form.cleaned_data.get('radius_km')
+        if radius_km is None:
+            radius_km = self.DEFAULT_RADIUS_KM
+        elif radius_km <= 0:
+            raise ValidationError({'radius_km': 'Радиус должен быть больше нуля'})
+        radius_km = min(float(radius_km), self.MAX_RADIUS_KM)
+        
+        queryset = self._filter_box(queryset, *radius_bbox(latitude, longitude, radius_km))
+        return queryset.annotate(
+            distance=distance_km_expression(latitude, longitude)
+        ).filter(distance__lte=radius_km)
+    
+    def radius_filter(self, queryset, name, value):
+        """Радиус применяется в near_filter"""
+        return queryset
+    
+    def _filter_box(self, queryset, min_lat, min_lon, max_lat, max_lon):
+        """Отбор по индексу geohash с точной проверкой координат"""
+        cells = Q()
+        for prefix in geohash_cover(min_lat, min_lon, max_lat, max_lon):
+            cells |= Q(geohash__startswith=prefix)
         return queryset.filter(
-            models.Q(title__icontains=value) |
-            models.Q(description__icontains=value) |
-            models.Q(organizer__icontains=value) |
-            models.Q(venue_name__icontains=value)
-        )
\ No newline at end of file
+            cells,
+            latitude__gte=min_lat, latitude__lte=max_lat,
+            longitude__gte=min_lon, longitude__lte=max_lon,
+        )
+    
+    @staticmethod
+    def _parse_floats(name, value, axes):
+        """
+        Координаты через запятую; axes — ось каждого числа ('lat' или 'lon')
+        
+        Бесконечности, NaN и значения вне [-90, 90] / [-180, 180] отклоняются:
+        иначе покрытие geohash перебирает неограниченное число ячеек.
+        """
+        try:
+            numbers = [float(part) for part in value.split(',')]
+        except ValueError:
+            numbers = []
+        if len(numbers) != len(axes):
+            raise ValidationError({name: f'Ожидается {len(axes)} числа через запятую'})
+        for number, axis in zip(numbers, axes):
+            limit = COORDINATE_LIMITS[axis]
+            if not math.isfinite(number) or abs(number) > limit:
+                raise ValidationError({name: 'Координаты вне допустимого диапазона (широта ±90, долгота ±180)'})
+        return numbers
+
+
+class EventOrderingFilter(filters.OrderingFilter):
+    """
+    Порядок по умолчанию: по релевантности при поиске, по расстоянию при
+    фильтре near, иначе — как задано во view
+    
+    ordering_aliases — короткие имена полей для ?ordering=
+    (например, ?ordering=-trending).
+    """
+    
+    ordering_aliases = {'trending': 'trending_score'}
+    
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        fields = [self._resolve_alias(field) for field in fields]
+        return super().remove_invalid_fields(queryset, fields, view, request)
+    
+    def _resolve_alias(self, field):
+        prefix = '-' if field.startswith('-') else ''
+        name = field.lstrip('-')
+        return prefix + self.ordering_aliases.get(name, name)
+    
+    def get_default_ordering(self, view):
+        if view.request.query_params.get('search', '').strip():
+            return ['-search_rank', 'start_date']
+        if view.request.query_params.get('near'):
+            return ['distance', 'start_date']
+        return super().get_default_ordering(view)
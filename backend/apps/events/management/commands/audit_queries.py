@@ -0,0 +1,288 @@
+# backend/apps/events/management/commands/audit_queries.py
+
+import json
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+from apps.events.models import Category, Event, UserEventInteraction
+from apps.notifications.models import Notification
+from apps.reviews.models import Review
+from config.urls import router
+
+# Параметры запросов по имени маршрута ({...} — значения из тестовых данных)
+PARAMETER_MATRIX = {
+    'event-list': [
+        '',
+        'city=Москва',
+        'search=концерт',
+        'search=кнцерт',
+        'category={category}',
+        'is_free=true&ordering=-views_count',
+        'ordering=-trending',
+        'start_date_from={today}&start_date_to={week}',
+        'near=55.7558,37.6173&radius_km=10',
+        'bbox=37.3,55.5,37.9,56.0',
+        'cursor=',
+        'show_past=true&page=2',
+    ],
+    'event-map-points': ['bbox=37.3,55.5,37.9,56.0', 'near=55.7558,37.6173&radius_km=10'],
+    'event-clusters': ['bbox=37.3,55.5,37.9,56.0&zoom=10'],
+    'event-batch': ['ids={ids}', 'slugs={slugs}'],
+    'event-calendar': ['month={month}', 'month={month}&city=Москва'],
+    'event-facets': ['', 'city=Москва&category={category}'],
+    'event-trending': ['', 'city=Москва'],
+    'event-export': ['city=Москва'],
+    'event-my-events': ['', 'type=going'],
+    'review-list': ['', 'event={event_id}'],
+}
+
+# Маршруты вне роутера API
+EXTRA_PATHS = [
+    ('auth-user', '/api/v1/auth/user/'),
+]
+
+# Пороги --fail-over
+METRICS = ('queries', 'seq_scans', 'time_ms', 'misestimate')
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет GET-запросы ко всем маршрутам API с набором параметров, '
+        'собирает SQL и выполняет для каждого запроса EXPLAIN (ANALYZE, BUFFERS): '
+        'последовательные сканирования, ошибки оценки строк, время и число запросов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Имя пользователя (по умолчанию — первый суперпользователь)')
+        parser.add_argument('--anonymous', action='store_true', help='Запросы без авторизации')
+        parser.add_argument('--route', action='append', dest='routes', help='Только эти маршруты (event-list и т.п.)')
+        parser.add_argument('--use-cache', action='store_true', help='Не отключать кэш ответов')
+        parser.add_argument(
+            '--seq-scan-min-rows', type=int, default=0,
+            help='Не считать последовательные сканирования, просмотревшие меньше строк'
+        )
+        parser.add_argument('--json', action='store_true', help='Отчет в формате JSON')
+        parser.add_argument('--output', '-o', help='Файл отчета (по умолчанию — stdout)')
+        parser.add_argument(
+            '--fail-over',
+            action='append',
+            default=[],
+            metavar='METRIC=VALUE',
+            help=f'Ошибка, если у маршрута метрика больше значения ({", ".join(METRICS)})'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('EXPLAIN (ANALYZE, BUFFERS) поддерживается только для PostgreSQL')
+        thresholds = self._parse_thresholds(options['fail_over'])
+        self.min_rows = options['seq_scan_min_rows']
+
+        client = Client(raise_request_exception=False, HTTP_HOST='localhost')
+        user = None if options['anonymous'] else self._get_user(options['user'])
+        if user is not None:
+            client.force_login(user)
+        samples = self._samples(user)
+
+        cache_settings = {} if options['use_cache'] else {
+            'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        }
+        with override_settings(**cache_settings):
+            results = [
+                self._audit(client, name, url)
+                for name, url in self._urls(samples, options['routes'])
+            ]
+
+        failures = [
+            f'{result["url"]}: {metric} = {result[metric]} > {limit}'
+            for result in results
+            for metric, limit in thresholds.items()
+            if result[metric] > limit
+        ]
+
+        report = self._render_json(results, failures) if options['json'] else self._render_text(results)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(report)
+        else:
+            self.stdout.write(report)
+
+        if failures:
+            for failure in failures:
+                self.stderr.write(self.style.ERROR(failure))
+            raise CommandError(f'Превышены пороги: {len(failures)}')
+
+    def _parse_thresholds(self, values):
+        thresholds = {}
+        for value in values:
+            metric, _, limit = value.partition('=')
+            if metric not in METRICS:
+                raise CommandError(f'Неизвестная метрика {metric}: ожидается одна из {", ".join(METRICS)}')
+            try:
+                thresholds[metric] = float(limit)
+            except ValueError:
+                raise CommandError(f'Ожидается {metric}=число')
+        return thresholds
+
+    def _get_user(self, username):
+        users = get_user_model().objects.filter(is_active=True)
+        if username:
+            user = users.filter(username=username).first()
+            if user is None:
+                raise CommandError(f'Пользователь {username} не найден')
+            return user
+        return users.order_by('-is_superuser', 'pk').first()
+
+    def _samples(self, user):
+        """Значения для параметров и URL детальных страниц из текущей базы"""
+        today = timezone.now().date()
+        events = list(Event.objects.filter(
+            status='published', start_date__gte=today
+        ).order_by('start_date', 'id').values('pk', 'slug')[:5])
+        category = Category.objects.order_by('pk').first()
+        user_objects = {
+            'interaction': UserEventInteraction.objects.filter(user=user),
+            'notification': Notification.objects.filter(user=user),
+        } if user is not None else {}
+
+        samples = {
+            'today': today.isoformat(),
+            'week': (today + timedelta(days=7)).isoformat(),
+            'month': today.strftime('%Y-%m'),
+            'ids': ','.join(str(event['pk']) for event in events),
+            'slugs': ','.join(event['slug'] for event in events),
+            'event_id': events[0]['pk'] if events else '',
+            'category': category.slug if category else '',
+            # Значения lookup-поля детальных маршрутов по basename
+            'detail:event': events[0]['slug'] if events else None,
+            'detail:category': category.slug if category else None,
+            'detail:review': Review.objects.filter(status='approved').values_list('pk', flat=True).first(),
+            'detail:user': user.pk if user is not None else None,
+        }
+        for basename, queryset in user_objects.items():
+            samples[f'detail:{basename}'] = queryset.values_list('pk', flat=True).first()
+        return samples
+
+    def _urls(self, samples, routes=None):
+        """(имя маршрута, URL) для GET-маршрутов роутера (или только routes) и параметров из матрицы"""
+        for prefix, viewset, basename in router.registry:
+            for route in router.get_routes(viewset):
+                if 'get' not in route.mapping:
+                    continue
+                name = route.name.format(basename=basename)
+                if routes and name not in routes:
+                    continue
+                kwargs = {}
+                if route.detail:
+                    value = samples.get(f'detail:{basename}')
+                    if value is None:
+                        self.stderr.write(f'Пропущен {name}: нет объекта для детальной страницы')
+                        continue
+                    kwargs[viewset.lookup_url_kwarg or viewset.lookup_field] = value
+                try:
+                    path = reverse(name, kwargs=kwargs)
+                except NoReverseMatch:
+                    continue
+                for query in PARAMETER_MATRIX.get(name, ['']):
+                    query = query.format(**samples)
+                    yield name, f'{path}?{query}' if query else path
+
+        for name, path in EXTRA_PATHS:
+            if not routes or name in routes:
+                yield name, path
+
+    def _audit(self, client, name, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        statements = [self._explain(query['sql']) for query in captured.captured_queries]
+        statements = [statement for statement in statements if statement is not None]
+        seq_scans = [scan for statement in statements for scan in statement['seq_scans']]
+        return {
+            'route': name,
+            'url': url,
+            'status': response.status_code,
+            'queries': len(captured.captured_queries),
+            'seq_scans': len(seq_scans),
+            'time_ms': round(sum(statement['execution_ms'] for statement in statements), 3),
+            'misestimate': max((statement['misestimate'] for statement in statements), default=1),
+            'shared_blocks': sum(statement['shared_hit'] + statement['shared_read'] for statement in statements),
+            'statements': statements,
+        }
+
+    def _explain(self, sql):
+        """План запроса SELECT с фактическими значениями (изменения откатываются)"""
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            return None
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}')
+                    plan = cursor.fetchone()[0]
+                transaction.set_rollback(True)
+        except DatabaseError as exc:
+            return {
+                'sql': sql, 'error': str(exc).strip(), 'execution_ms': 0, 'planning_ms': 0,
+                'seq_scans': [], 'misestimate': 1, 'shared_hit': 0, 'shared_read': 0,
+            }
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        plan = plan[0]
+        root = plan['Plan']
+
+        seq_scans = []
+        misestimate = 1
+        for node in self._walk(root):
+            if node['Node Type'] == 'Seq Scan':
+                rows = (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * node.get('Actual Loops', 1)
+                if rows >= self.min_rows:
+                    seq_scans.append({
+                        'table': node['Relation Name'],
+                        'rows': rows,
+                        'filter': node.get('Filter', ''),
+                    })
+            if node.get('Actual Loops'):
+                estimated, actual = node['Plan Rows'], node['Actual Rows']
+                misestimate = max(misestimate, max(estimated, actual) / max(min(estimated, actual), 1))
+
+        return {
+            'sql': sql,
+            'execution_ms': plan.get('Execution Time', 0),
+            'planning_ms': plan.get('Planning Time', 0),
+            'seq_scans': seq_scans,
+            'misestimate': round(misestimate, 1),
+            'shared_hit': root.get('Shared Hit Blocks', 0),
+            'shared_read': root.get('Shared Read Blocks', 0),
+        }
+
+    def _walk(self, node):
+        yield node
+        for child in node.get('Plans', []):
+            yield from self._walk(child)
+
+    def _render_json(self, results, failures):
+        return json.dumps({'results': results, 'failures': failures}, ensure_ascii=False, indent=2) + '\n'
+
+    def _render_text(self, results):
+        lines = []
+        for result in results:
+            style = self.style.WARNING if result['seq_scans'] or result['status'] >= 400 else self.style.SUCCESS
+            lines.append(style(
+                f'{result["status"]} {result["url"]}: запросов {result["queries"]}, '
+                f'SQL {result["time_ms"]:.2f} мс, seq scan {result["seq_scans"]}, '
+                f'ошибка оценки x{result["misestimate"]}, блоков {result["shared_blocks"]}'
+            ))
+            for statement in result['statements']:
+                if statement.get('error'):
+                    lines.append(f'    EXPLAIN не выполнен: {statement["error"]}')
+                for scan in statement['seq_scans']:
+                    lines.append(
+                        f'    Seq Scan {scan["table"]} ({scan["rows"]} строк) {scan["filter"]}'.rstrip()
+                    )
+        return '\n'.join(lines) + '\n'
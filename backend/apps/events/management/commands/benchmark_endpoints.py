@@ -0,0 +1,429 @@
+# backend/apps/events/management/commands/benchmark_endpoints.py
+
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import time as time_of_day, timedelta
+from decimal import Decimal
+from itertools import combinations
+from urllib.parse import urlencode, urlsplit
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core import mail
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from apps.events import counters
+from apps.events.models import Category, Event, UserEventInteraction
+from apps.notifications import tasks
+from apps.notifications.models import Notification
+from apps.reviews.models import Review
+from config.celery import app as celery_app
+from utils.geo import geohash_encode
+
+# Параметры EventFilter для списка мероприятий ({...} — значения из набора данных);
+# radius_km отдельно не проверяется — он действует только вместе с near
+FILTER_PARAMS = {
+    'search': {'search': 'концерт'},
+    'start_date_from': {'start_date_from': '{today}'},
+    'start_date_to': {'start_date_to': '{month}'},
+    'category': {'category': 'concerts'},
+    'city': {'city': 'Москва'},
+    'is_free': {'is_free': 'true'},
+    'age_restriction': {'age_restriction': '18+'},
+    'organizer': {'organizer': 'Филармония'},
+    'is_featured': {'is_featured': 'true'},
+    'bbox': {'bbox': '37.3,55.5,37.9,56.0'},
+    'near': {'near': '55.7558,37.6173', 'radius_km': '10'},
+}
+
+CATEGORIES = [
+    ('Концерты', 'concerts'),
+    ('Театр', 'theatre'),
+    ('Выставки', 'exhibitions'),
+    ('Кино', 'cinema'),
+    ('Спорт', 'sport'),
+    ('Детям', 'kids'),
+    ('Лекции', 'lectures'),
+    ('Фестивали', 'festivals'),
+]
+
+# Город: (широта, долгота) центра
+CITIES = {
+    'Москва': (55.7558, 37.6173),
+    'Санкт-Петербург': (59.9343, 30.3351),
+    'Казань': (55.7963, 49.1088),
+    'Екатеринбург': (56.8389, 60.6057),
+    'Новосибирск': (55.0084, 82.9357),
+}
+
+TITLE_KINDS = ['Концерт', 'Спектакль', 'Выставка', 'Показ', 'Матч', 'Лекция', 'Мастер-класс', 'Фестиваль']
+TITLE_NAMES = ['Весна', 'Северное сияние', 'Джаз на крыше', 'Классика', 'Город огней', 'Новые имена', 'Белые ночи']
+ORGANIZERS = ['Филармония', 'Городской театр', 'Дом культуры', 'Арт-центр', 'Спортивный клуб']
+WORDS = (
+    'музыка оркестр премьера искусство история город программа гости вечер '
+    'участники сцена выступление зрители билеты открытие проект авторы'
+).split()
+
+# Параметры, при различии которых результаты прогонов несравнимы
+DATASET_KEYS = ('seed', 'events', 'users')
+
+# Метрики времени для --compare
+LATENCY_METRICS = ('p50_ms', 'p95_ms')
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон горячих путей API и задач уведомлений на детерминированном '
+        'наборе данных в отдельной тестовой базе: p50/p95 времени, число SQL-запросов '
+        'и пиковая память; результаты в JSON и сравнение с предыдущим прогоном'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help='Зерно генератора набора данных')
+        parser.add_argument('--events', type=int, default=2000, help='Мероприятий в наборе данных')
+        parser.add_argument('--users', type=int, default=200, help='Пользователей в наборе данных')
+        parser.add_argument('--repeat', type=int, default=20, help='Замеров на каждый запрос')
+        parser.add_argument('--task-repeat', type=int, default=5, help='Замеров на каждую задачу')
+        parser.add_argument('--warmup', type=int, default=2, help='Прогревочных выполнений (не учитываются)')
+        parser.add_argument(
+            '--max-combination', type=int, default=2,
+            help='Наибольшее число фильтров EventFilter в одном запросе списка'
+        )
+        parser.add_argument('--only', action='append', help='Только замеры, в названии которых есть подстрока')
+        parser.add_argument('--use-cache', action='store_true', help='Не отключать кэш ответов')
+        parser.add_argument(
+            '--redis-url',
+            help='Redis для счетчиков и кэша во время прогона (по умолчанию — база 15 из REDIS_URL)'
+        )
+        parser.add_argument(
+            '--keepdb', action='store_true',
+            help='Не удалять тестовую базу после прогона (и использовать существующую)'
+        )
+        parser.add_argument('--output', '-o', help='Файл результатов JSON')
+        parser.add_argument('--compare', metavar='BASELINE', help='JSON предыдущего прогона для сравнения')
+        parser.add_argument(
+            '--max-slowdown', type=float, default=20,
+            help='Допустимое замедление относительно --compare, проценты'
+        )
+        parser.add_argument(
+            '--metric', choices=LATENCY_METRICS, default='p50_ms',
+            help='Метрика времени для сравнения'
+        )
+        parser.add_argument(
+            '--min-delta-ms', type=float, default=1,
+            help='Не считать замедлением разницу меньше этого значения, мс'
+        )
+
+    def handle(self, *args, **options):
+        if min(options['repeat'], options['task_repeat']) < 2:
+            raise CommandError('Для p50/p95 нужно не меньше двух замеров (--repeat, --task-repeat)')
+        baseline = self._load_baseline(options['compare'], options) if options['compare'] else None
+
+        redis_url = options['redis_url'] or urlsplit(settings.REDIS_URL)._replace(path='/15').geturl()
+        cache_backend = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': redis_url,
+        } if options['use_cache'] else {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb']
+        )
+        eager = celery_app.conf.task_always_eager
+        # Клиент Redis счетчиков создается при первом обращении — уже с redis_url
+        counters._redis_client = None
+        try:
+            with override_settings(
+                REDIS_URL=redis_url,
+                CACHES={'default': cache_backend},
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                METRICS_ENABLED=False,
+            ):
+                # Письма задач уведомлений отправляются в том же процессе
+                celery_app.conf.task_always_eager = True
+                if options['keepdb']:
+                    call_command('flush', interactive=False, verbosity=0)
+                started = time.perf_counter()
+                samples = self._seed(options)
+                self.stdout.write(
+                    f'Набор данных: {options["events"]} мероприятий, {options["users"]} пользователей '
+                    f'({time.perf_counter() - started:.1f} с)'
+                )
+                results = self._run(samples, options)
+        finally:
+            celery_app.conf.task_always_eager = eager
+            counters._redis_client = None
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        report = {
+            'meta': {
+                **{key: options[key] for key in DATASET_KEYS},
+                'repeat': options['repeat'],
+                'task_repeat': options['task_repeat'],
+                'use_cache': options['use_cache'],
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+                output.write('\n')
+
+        failures = self._compare(results, baseline, options) if baseline is not None else []
+        self.stdout.write(self._render_text(results, baseline, options['metric']))
+        if failures:
+            for failure in failures:
+                self.stderr.write(self.style.ERROR(failure))
+            raise CommandError(f'Замедление относительно {options["compare"]}: {len(failures)}')
+
+    def _load_baseline(self, path, options):
+        try:
+            with open(path, encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Не удалось прочитать {path}: {exc}')
+        different = [key for key in DATASET_KEYS if baseline['meta'].get(key) != options[key]]
+        if different:
+            raise CommandError(
+                f'Набор данных {path} отличается ({", ".join(different)}): '
+                f'запустите с теми же --seed, --events и --users'
+            )
+        return baseline['results']
+
+    def _seed(self, options):
+        """
+        Детерминированный набор данных (зависит только от --seed, --events,
+        --users и текущей даты). Возвращает значения для параметров запросов.
+        """
+        rng = random.Random(options['seed'])
+        today = timezone.now().date()
+
+        categories = Category.objects.bulk_create([
+            Category(name=name, slug=slug) for name, slug in CATEGORIES
+        ])
+
+        users = get_user_model().objects.bulk_create([
+            get_user_model()(
+                username=f'bench{index}',
+                email=f'bench{index}@example.com',
+                password=make_password(None),
+                city=rng.choice(list(CITIES)),
+                email_notifications=rng.random() < 0.8,
+                notification_frequency=rng.choice(['daily', 'weekly', 'instant']),
+            )
+            for index in range(options['users'])
+        ], batch_size=1000)
+
+        events = []
+        for index in range(options['events']):
+            city = rng.choice(list(CITIES))
+            latitude, longitude = (value + rng.uniform(-0.15, 0.15) for value in CITIES[city])
+            start_date = today + timedelta(days=rng.randint(-30, 90))
+            is_free = rng.random() < 0.4
+            price_min = None if is_free else Decimal(rng.randrange(300, 3000, 100))
+            events.append(Event(
+                title=f'{rng.choice(TITLE_KINDS)} «{rng.choice(TITLE_NAMES)}» №{index}',
+                slug=f'bench-{index}',
+                short_description=' '.join(rng.choices(WORDS, k=12)),
+                description=' '.join(rng.choices(WORDS, k=rng.randint(40, 200))),
+                category=rng.choice(categories),
+                start_date=start_date,
+                start_time=time_of_day(rng.randint(10, 21), rng.choice([0, 30])),
+                end_date=start_date + timedelta(days=rng.randint(1, 10)) if rng.random() < 0.2 else None,
+                address=f'{city}, ул. {rng.choice(TITLE_NAMES)}, {rng.randint(1, 120)}',
+                city=city,
+                latitude=Decimal(f'{latitude:.6f}'),
+                longitude=Decimal(f'{longitude:.6f}'),
+                geohash=geohash_encode(latitude, longitude),
+                organizer=rng.choice(ORGANIZERS),
+                is_free=is_free,
+                price_min=price_min,
+                price_max=None if is_free else price_min * 2,
+                age_restriction=rng.choice(Event.AGE_CHOICES)[0],
+                status=rng.choices(['published', 'draft', 'cancelled'], weights=[90, 5, 5])[0],
+                is_featured=rng.random() < 0.03,
+                source='benchmark',
+                views_count=rng.randint(0, 5000),
+                trending_score=rng.random() * 100 if rng.random() < 0.3 else 0,
+            ))
+        events = Event.objects.bulk_create(events, batch_size=1000)
+        published = [event for event in events if event.status == 'published']
+
+        # Первый пользователь — тот, от имени которого идут запросы
+        interactions = []
+        for index, user in enumerate(users):
+            for event in rng.sample(published, min(len(published), 60 if index == 0 else rng.randint(0, 20))):
+                interactions.append(UserEventInteraction(
+                    user=user, event=event, interaction_type=rng.choice(['interested', 'going'])
+                ))
+        UserEventInteraction.objects.bulk_create(interactions, batch_size=5000)
+
+        reviews = []
+        for event in rng.sample(published, len(published) // 3):
+            for user in rng.sample(users, min(len(users), rng.randint(1, 8))):
+                reviews.append(Review(
+                    event=event, user=user, rating=rng.randint(1, 5),
+                    text=' '.join(rng.choices(WORDS, k=20)),
+                    status=rng.choices(['approved', 'pending'], weights=[85, 15])[0],
+                ))
+        Review.objects.bulk_create(reviews, batch_size=5000)
+
+        notifications = []
+        for index, user in enumerate(users):
+            for _ in range(50 if index == 0 else rng.randint(0, 30)):
+                event = rng.choice(published)
+                notification_type, label = rng.choice(Notification.TYPE_CHOICES)
+                notifications.append(Notification(
+                    user=user, event=event, notification_type=notification_type,
+                    title=f'{label}: {event.title}', message=' '.join(rng.choices(WORDS, k=15)),
+                    is_read=rng.random() < 0.5, is_sent=True,
+                ))
+        Notification.objects.bulk_create(notifications, batch_size=5000)
+
+        Event.recalculate_ratings()
+        Event.recalculate_interaction_counts()
+        Event.complete_past()
+
+        upcoming = Event.objects.filter(status='published', start_date__gte=today)
+        user = users[0]
+        return {
+            'user': user,
+            'today': today.isoformat(),
+            'month': (today + timedelta(days=30)).isoformat(),
+            'slug': upcoming.order_by('-reviews_count', 'pk').values_list('slug', flat=True).first(),
+            'reviewed_event': upcoming.order_by('-reviews_count', 'pk').values_list('pk', flat=True).first(),
+            'popular_event': upcoming.order_by('-interested_count', '-going_count', 'pk').values_list(
+                'pk', flat=True
+            ).first(),
+            'notification': Notification.objects.filter(user__email_notifications=True).order_by('pk').values_list(
+                'pk', flat=True
+            ).first(),
+        }
+
+    def _cases(self, samples, options):
+        """(название, тип, цель): тип 'get' — URL, 'task' — (задача, аргументы)"""
+        for size in range(options['max_combination'] + 1):
+            for names in combinations(FILTER_PARAMS, size):
+                params = {}
+                for name in names:
+                    params.update({key: value.format(**samples) for key, value in FILTER_PARAMS[name].items()})
+                query = f'?{urlencode(params)}' if params else ''
+                yield f'EventViewSet.list[{",".join(names)}]', 'get', f'/api/v1/events/{query}'
+
+        yield 'EventViewSet.retrieve', 'get', f'/api/v1/events/{samples["slug"]}/'
+        yield 'EventViewSet.my_events', 'get', '/api/v1/events/my_events/'
+        yield 'EventViewSet.featured', 'get', '/api/v1/events/featured/'
+        yield 'ReviewViewSet.list', 'get', '/api/v1/reviews/'
+        yield 'ReviewViewSet.list[event]', 'get', f'/api/v1/reviews/?event={samples["reviewed_event"]}'
+        yield 'NotificationViewSet.unread_count', 'get', '/api/v1/notifications/unread_count/'
+
+        yield 'tasks.send_notification_email', 'task', (tasks.send_notification_email, [samples['notification']])
+        yield 'tasks.send_event_reminders', 'task', (tasks.send_event_reminders, [])
+        yield 'tasks.send_new_events_digest', 'task', (tasks.send_new_events_digest, [])
+        yield 'tasks.notify_event_update', 'task', (tasks.notify_event_update, [samples['popular_event']])
+        yield 'tasks.notify_event_cancelled', 'task', (tasks.notify_event_cancelled, [samples['popular_event']])
+
+    def _run(self, samples, options):
+        client = Client(raise_request_exception=False, HTTP_HOST='localhost')
+        client.force_login(samples['user'])
+
+        results = {}
+        for name, kind, target in self._cases(samples, options):
+            if options['only'] and not any(part in name for part in options['only']):
+                continue
+            if kind == 'get':
+                def call(url=target):
+                    return client.get(url).status_code
+            else:
+                def call(task=target[0], args=target[1]):
+                    task(*args)
+                    mail.outbox = []
+                    return None
+            repeat = options['repeat'] if kind == 'get' else options['task_repeat']
+            results[name] = self._measure(call, repeat, options['warmup'])
+        return results
+
+    def _measure(self, call, repeat, warmup):
+        """
+        Каждое выполнение — в откатываемой транзакции, чтобы задачи и счетчики
+        просмотров не меняли данные следующих замеров. Время замеряется без
+        tracemalloc и отладочного курсора, память и запросы — отдельным выполнением.
+        """
+        for _ in range(warmup):
+            self._rolled_back(call)
+
+        timings = []
+        for _ in range(repeat):
+            with transaction.atomic():
+                started = time.perf_counter()
+                status = call()
+                timings.append((time.perf_counter() - started) * 1000)
+                transaction.set_rollback(True)
+
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as captured:
+                self._rolled_back(call)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        quantiles = statistics.quantiles(timings, n=20, method='inclusive')
+        return {
+            'status': status,
+            'p50_ms': round(quantiles[9], 3),
+            'p95_ms': round(quantiles[18], 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries': len(captured.captured_queries),
+            'peak_kib': round(peak / 1024, 1),
+        }
+
+    @staticmethod
+    def _rolled_back(call):
+        with transaction.atomic():
+            call()
+            transaction.set_rollback(True)
+
+    def _compare(self, results, baseline, options):
+        """Замедления больше --max-slowdown процентов и рост числа запросов"""
+        metric = options['metric']
+        failures = []
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            delta = result[metric] - before[metric]
+            if before[metric] and delta > options['min_delta_ms']:
+                percent = delta / before[metric] * 100
+                if percent > options['max_slowdown']:
+                    failures.append(
+                        f'{name}: {metric} {before[metric]:.2f} -> {result[metric]:.2f} мс (+{percent:.0f}%)'
+                    )
+            if result['queries'] > before['queries']:
+                failures.append(f'{name}: запросов {before["queries"]} -> {result["queries"]}')
+        return failures
+
+    def _render_text(self, results, baseline, metric):
+        lines = []
+        width = max((len(name) for name in results), default=0)
+        for name, result in results.items():
+            line = (
+                f'{name:<{width}}  p50 {result["p50_ms"]:8.2f} мс  p95 {result["p95_ms"]:8.2f} мс  '
+                f'запросов {result["queries"]:3}  память {result["peak_kib"]:8.1f} КиБ'
+            )
+            before = (baseline or {}).get(name)
+            if before is not None and before[metric]:
+                line += f'  {metric} {(result[metric] - before[metric]) / before[metric] * 100:+.0f}%'
+            failed = result['status'] is not None and result['status'] >= 400
+            lines.append(self.style.WARNING(line) if failed else line)
+        return '\n'.join(lines)
@@ -0,0 +1,56 @@
+# backend/apps/events/management/commands/benchmark_renderers.py
+
+import gzip
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apps.events.models import Event
+from apps.events.serializers import EventListSerializer
+from utils.renderers import MessagePackRenderer, ORJSONRenderer
+
+RENDERERS = [
+    ('drf-json', JSONRenderer),
+    ('orjson', ORJSONRenderer),
+    ('msgpack', MessagePackRenderer),
+]
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает время рендеринга и размер ответа списка мероприятий для разных рендереров'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Мероприятий в ответе')
+        parser.add_argument('--repeat', type=int, default=200, help='Повторов рендеринга')
+        parser.add_argument('--host', default='localhost', help='Host для абсолютных URL')
+
+    def handle(self, *args, **options):
+        request = Request(APIRequestFactory().get('/api/v1/events/', HTTP_HOST=options['host']))
+        events = Event.objects.select_related('category').filter(
+            status='published'
+        )[:options['limit']]
+        data = EventListSerializer(events, many=True, context={'request': request}).data
+        if not data:
+            raise CommandError('Нет опубликованных мероприятий')
+
+        self.stdout.write(f'Мероприятий: {len(data)}, повторов: {options["repeat"]}')
+        baseline = None
+        payloads = {}
+        for name, renderer_class in RENDERERS:
+            renderer = renderer_class()
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                payload = renderer.render(data, renderer.media_type, {})
+            elapsed = (time.perf_counter() - started) / options['repeat'] * 1000
+            baseline = baseline or elapsed
+            payloads[name] = payload
+
+            self.stdout.write(
+                f'{name:<10} {elapsed:8.3f} мс  x{baseline / elapsed:5.1f}  '
+                f'{len(payload):>8} байт  {len(gzip.compress(payload)):>7} байт gzip'
+            )
+
+        if payloads['orjson'] != payloads['drf-json']:
+            raise CommandError('Ответы orjson и JSONRenderer различаются')
+        self.stdout.write(self.style.SUCCESS('JSON orjson совпадает с JSONRenderer'))
@@ -0,0 +1,111 @@
+# backend/apps/events/management/commands/check_list_parity.py
+
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.events.views import EventViewSet
+from utils.renderers import ORJSONRenderer
+
+# Варианты параметров /api/v1/events/, на которых сравниваются ответы
+DEFAULT_QUERIES = [
+    '',
+    'show_past=true',
+    'ordering=-views_count',
+    'page=2',
+    'cursor=',
+    'search=концерт',
+    'is_free=true',
+    'near=55.7558,37.6173&radius_km=50',
+    'fields=id,title,image,start_time,price_min,average_rating',
+    'omit=short_description,search_headline',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает ответ списка мероприятий, собранный быстрой сериализацией, '
+        'с ответом EventListSerializer и JSON ORJSONRenderer с JSONRenderer '
+        '(байт в байт) и замеряет время'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            help='Параметры запроса, например "search=джаз&is_free=true" (можно несколько раз)'
+        )
+        parser.add_argument('--page-size', type=int, default=100, help='Размер страницы')
+        parser.add_argument('--repeat', type=int, default=5, help='Повторов для замера времени')
+        parser.add_argument('--host', default='localhost', help='Host для абсолютных URL')
+        parser.add_argument('--user', help='Имя пользователя (по умолчанию — анонимный запрос)')
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        renderer = JSONRenderer()
+        orjson_renderer = ORJSONRenderer()
+        failures = []
+        user = None
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(username=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Пользователь {options["user"]} не найден')
+
+        for query in options['queries'] or DEFAULT_QUERIES:
+            request = factory.get(f'/api/v1/events/?{query}', HTTP_HOST=options['host'])
+            if user is not None:
+                force_authenticate(request, user)
+
+            outputs = {}
+            timings = {}
+            for mode, fast_actions in (('model', ()), ('fast', ('list',))):
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    data = self._list(request, fast_actions, options['page_size'])
+                timings[mode] = (time.perf_counter() - started) / options['repeat'] * 1000
+                outputs[mode] = renderer.render(data)
+            outputs['orjson'] = orjson_renderer.render(data)
+
+            speedup = timings['model'] / timings['fast'] if timings['fast'] else 0
+            line = (
+                f'"{query}": {len(outputs["fast"])} байт, '
+                f'{timings["model"]:.1f} мс -> {timings["fast"]:.1f} мс (x{speedup:.1f})'
+            )
+            diffs = [
+                (expected, actual)
+                for expected, actual in (('model', 'fast'), ('fast', 'orjson'))
+                if outputs[expected] != outputs[actual]
+            ]
+            if not diffs:
+                self.stdout.write(self.style.SUCCESS(f'OK   {line}'))
+                continue
+
+            failures.append(query)
+            self.stdout.write(self.style.ERROR(f'DIFF {line}'))
+            for expected, actual in diffs:
+                self._write_diff(outputs, expected, actual)
+
+        if failures:
+            raise CommandError(f'Ответы различаются: {len(failures)}')
+
+    def _write_diff(self, outputs, expected, actual):
+        """Окрестность первого различия двух ответов"""
+        offset = next(
+            (i for i, (a, b) in enumerate(zip(outputs[expected], outputs[actual])) if a != b),
+            min(len(outputs[expected]), len(outputs[actual]))
+        )
+        self.stdout.write(f'  {expected}: {outputs[expected][max(offset - 80, 0):offset + 80]!r}')
+        self.stdout.write(f'  {actual}: {outputs[actual][max(offset - 80, 0):offset + 80]!r}')
+
+    def _list(self, django_request, fast_actions, page_size):
+        """Данные ответа EventViewSet.list без кэша анонимных ответов"""
+        view = EventViewSet(action_map={'get': 'list'}, format_kwarg=None)
+        view.fast_list_actions = fast_actions
+        view.args, view.kwargs = (), {}
+        view.request = view.initialize_request(django_request)
+        view.headers = {}
+        view.paginator.page_size = page_size
+        return view._list(view.request).data
@@ -0,0 +1,75 @@
+# backend/apps/events/management/commands/export_events.py
+
+import sys
+from urllib.parse import urlencode
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory
+from apps.events.export import EXPORT_CHUNK_SIZE, EventExport
+from apps.events.views import EventViewSet
+from utils.renderers import CSVRenderer, NDJSONRenderer
+
+RENDERERS = {
+    'ndjson': NDJSONRenderer,
+    'csv': CSVRenderer,
+}
+
+
+class Command(BaseCommand):
+    help = 'Выгрузка мероприятий в NDJSON или CSV (те же фильтры, что у /api/v1/events/export/)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=RENDERERS, default='ndjson', help='Формат выгрузки')
+        parser.add_argument('--output', '-o', help='Файл (по умолчанию stdout)')
+        parser.add_argument(
+            '--filter',
+            action='append',
+            default=[],
+            metavar='PARAM=VALUE',
+            help='Параметр EventFilter, например --filter city=Москва (можно несколько раз)'
+        )
+        parser.add_argument('--show-past', action='store_true', help='Включая прошедшие мероприятия')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Строк за одно чтение из БД')
+        parser.add_argument('--host', default='localhost', help='Host для абсолютных URL изображений')
+
+    def handle(self, *args, **options):
+        params = []
+        for item in options['filter']:
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Ожидается PARAM=VALUE: {item}')
+            params.append((name, value))
+        if options['show_past']:
+            params.append(('show_past', 'true'))
+
+        django_request = APIRequestFactory().get(
+            f'/api/v1/events/export/?{urlencode(params)}', HTTP_HOST=options['host']
+        )
+        view = EventViewSet(action_map={'get': 'export'}, format_kwarg=None)
+        view.args, view.kwargs = (), {}
+        view.request = view.initialize_request(django_request)
+        try:
+            queryset = view.filter_queryset(view.get_queryset())
+        except ValidationError as exc:
+            raise CommandError(f'Некорректные фильтры: {exc.detail}')
+        export = EventExport(queryset, view.request, options['chunk_size'])
+
+        renderer = RENDERERS[options['format']]()
+        stream = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in renderer.stream(self._count(export.rows()), export.fields):
+                stream.write(chunk)
+        finally:
+            if options['output']:
+                stream.close()
+            else:
+                stream.flush()
+
+        self.stderr.write(self.style.SUCCESS(f'Выгружено мероприятий: {self.exported}'))
+
+    def _count(self, rows):
+        """Пропускает строки, подсчитывая их в self.exported"""
+        self.exported = 0
+        for row in rows:
+            self.exported += 1
+            yield row
@@ -0,0 +1,13 @@
+# backend/apps/events/management/commands/rebuild_map_clusters.py
+
+from django.core.management.base import BaseCommand
+from apps.events import clusters
+
+class Command(BaseCommand):
+    help = 'Полная пересборка пирамиды кластеров карты'
+
+    def handle(self, *args, **options):
+        cluster_count = clusters.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Кластеров карты: {cluster_count}')
+        )
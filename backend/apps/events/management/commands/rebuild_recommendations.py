@@ -0,0 +1,13 @@
+# backend/apps/events/management/commands/rebuild_recommendations.py
+
+from django.core.management.base import BaseCommand
+from apps.events import recommendations
+
+class Command(BaseCommand):
+    help = 'Пересчет списков рекомендаций мероприятий для пользователей'
+
+    def handle(self, *args, **options):
+        user_count = recommendations.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пользователей со списком рекомендаций: {user_count}')
+        )
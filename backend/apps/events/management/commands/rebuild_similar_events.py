@@ -0,0 +1,13 @@
+# backend/apps/events/management/commands/rebuild_similar_events.py
+
+from django.core.management.base import BaseCommand
+from apps.events import similarity
+
+class Command(BaseCommand):
+    help = 'Полная пересборка индекса похожих мероприятий'
+
+    def handle(self, *args, **options):
+        event_count = similarity.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Мероприятий в индексе похожих: {event_count}')
+        )
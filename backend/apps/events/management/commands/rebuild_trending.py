@@ -0,0 +1,16 @@
+# backend/apps/events/management/commands/rebuild_trending.py
+
+from django.core.management.base import BaseCommand
+from apps.events import trending
+
+class Command(BaseCommand):
+    help = 'Пересчет рейтинга популярности по отметкам и отзывам за последние дни'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=14, help='Учитываемый период, дней')
+
+    def handle(self, *args, **options):
+        event_count = trending.rebuild(days=options['days'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Мероприятий с рейтингом популярности: {event_count}')
+        )
@@ -0,0 +1,30 @@
+# backend/apps/events/management/commands/recalculate_ratings.py
+
+from django.core.management.base import BaseCommand
+from apps.events.models import Event
+
+class Command(BaseCommand):
+    help = 'Пересчет агрегатов рейтинга мероприятий по одобренным отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            type=int,
+            action='append',
+            dest='event_ids',
+            help='ID мероприятия (можно указать несколько раз; по умолчанию все)'
+        )
+
+    def handle(self, *args, **options):
+        event_ids = options['event_ids']
+
+        if event_ids:
+            self.stdout.write(f'Пересчет рейтингов для мероприятий: {event_ids}')
+        else:
+            self.stdout.write('Пересчет рейтингов для всех мероприятий')
+
+        updated_count = Event.recalculate_ratings(event_ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено мероприятий: {updated_count}')
+        )
@@ -0,0 +1,350 @@
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Category",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="Название"
+                    ),
+                ),
+                ("slug", models.SlugField(unique=True, verbose_name="Слаг")),
+                ("description", models.TextField(blank=True, verbose_name="Описание")),
+                (
+                    "icon",
+                    models.CharField(
+                        blank=True,
+                        help_text="Название иконки",
+                        max_length=50,
+                        verbose_name="Иконка",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Категория",
+                "verbose_name_plural": "Категории",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Event",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200, verbose_name="Название")),
+                (
+                    "slug",
+                    models.SlugField(blank=True, unique=True, verbose_name="Слаг"),
+                ),
+                ("description", models.TextField(verbose_name="Описание")),
+                (
+                    "short_description",
+                    models.CharField(
+                        blank=True, max_length=300, verbose_name="Краткое описание"
+                    ),
+                ),
+                ("start_date", models.DateField(verbose_name="Дата начала")),
+                (
+                    "start_time",
+                    models.TimeField(
+                        blank=True, null=True, verbose_name="Время начала"
+                    ),
+                ),
+                (
+                    "end_date",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="Дата окончания"
+                    ),
+                ),
+                (
+                    "end_time",
+                    models.TimeField(
+                        blank=True, null=True, verbose_name="Время окончания"
+                    ),
+                ),
+                ("address", models.CharField(max_length=300, verbose_name="Адрес")),
+                ("city", models.CharField(max_length=100, verbose_name="Город")),
+                (
+                    "latitude",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=6,
+                        max_digits=9,
+                        null=True,
+                        verbose_name="Широта",
+                    ),
+                ),
+                (
+                    "longitude",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=6,
+                        max_digits=9,
+                        null=True,
+                        verbose_name="Долгота",
+                    ),
+                ),
+                (
+                    "venue_name",
+                    models.CharField(
+                        blank=True, max_length=200, verbose_name="Название места"
+                    ),
+                ),
+                (
+                    "organizer",
+                    models.CharField(max_length=200, verbose_name="Организатор"),
+                ),
+                (
+                    "organizer_email",
+                    models.EmailField(
+                        blank=True, max_length=254, verbose_name="Email организатора"
+                    ),
+                ),
+                (
+                    "organizer_phone",
+                    models.CharField(
+                        blank=True, max_length=20, verbose_name="Телефон организатора"
+                    ),
+                ),
+                (
+                    "organizer_website",
+                    models.URLField(blank=True, verbose_name="Сайт организатора"),
+                ),
+                (
+                    "is_free",
+                    models.BooleanField(default=True, verbose_name="Бесплатное"),
+                ),
+                (
+                    "price_min",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        validators=[django.core.validators.MinValueValidator(0)],
+                        verbose_name="Минимальная цена",
+                    ),
+                ),
+                (
+                    "price_max",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        validators=[django.core.validators.MinValueValidator(0)],
+                        verbose_name="Максимальная цена",
+                    ),
+                ),
+                (
+                    "ticket_url",
+                    models.URLField(
+                        blank=True, verbose_name="Ссылка на покупку билетов"
+                    ),
+                ),
+                (
+                    "age_restriction",
+                    models.CharField(
+                        choices=[
+                            ("0+", "0+"),
+                            ("6+", "6+"),
+                            ("12+", "12+"),
+                            ("16+", "16+"),
+                            ("18+", "18+"),
+                        ],
+                        default="0+",
+                        max_length=3,
+                        verbose_name="Возрастное ограничение",
+                    ),
+                ),
+                (
+                    "image",
+                    models.ImageField(
+                        blank=True,
+                        null=True,
+                        upload_to="events/",
+                        verbose_name="Изображение",
+                    ),
+                ),
+                (
+                    "video_url",
+                    models.URLField(blank=True, verbose_name="Ссылка на видео"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("draft", "Черновик"),
+                            ("published", "Опубликовано"),
+                            ("cancelled", "Отменено"),
+                            ("completed", "Завершено"),
+                        ],
+                        default="published",
+                        max_length=20,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "is_featured",
+                    models.BooleanField(default=False, verbose_name="Рекомендуемое"),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        default="manual",
+                        help_text="manual или yandex_afisha",
+                        max_length=50,
+                        verbose_name="Источник",
+                    ),
+                ),
+                (
+                    "external_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="ID из внешнего API",
+                        max_length=100,
+                        verbose_name="Внешний ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата создания"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Дата обновления"),
+                ),
+                (
+                    "views_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество просмотров"
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="events",
+                        to="events.category",
+                        verbose_name="Категория",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="created_events",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Создано пользователем",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Мероприятие",
+                "verbose_name_plural": "Мероприятия",
+                "ordering": ["start_date", "start_time"],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserEventInteraction",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "interaction_type",
+                    models.CharField(
+                        choices=[("interested", "Интересно"), ("going", "Я пойду")],
+                        max_length=20,
+                        verbose_name="Тип взаимодействия",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата добавления"
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_interactions",
+                        to="events.event",
+                        verbose_name="Мероприятие",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="event_interactions",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Взаимодействие с мероприятием",
+                "verbose_name_plural": "Взаимодействия с мероприятиями",
+                "unique_together": {("user", "event", "interaction_type")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["start_date", "city"], name="events_even_start_d_577769_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["category", "status"], name="events_even_categor_f85a11_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["slug"], name="events_even_slug_30eb0f_idx"),
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    Review = apps.get_model("reviews", "Review")
+
+    rows = (
+        Review.objects.filter(status="approved")
+        .values("event_id")
+        .annotate(
+            reviews_count=Count("id"),
+            rating_sum=Sum("rating"),
+            **{
+                f"rating_{rating}_count": Count("id", filter=Q(rating=rating))
+                for rating in range(1, 6)
+            },
+        )
+    )
+    for row in rows:
+        Event.objects.filter(pk=row.pop("event_id")).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0001_initial"),
+        ("reviews", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="rating_1_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Оценок 1"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="rating_2_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Оценок 2"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="rating_3_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Оценок 3"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="rating_4_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Оценок 4"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="rating_5_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Оценок 5"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, verbose_name="Сумма оценок"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="reviews_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Количество отзывов"
+            ),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+from utils.geo import geohash_encode
+
+
+def backfill_geohash(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    events = Event.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    batch = []
+    for event in events.only("pk", "latitude", "longitude").iterator(chunk_size=2000):
+        event.geohash = geohash_encode(event.latitude, event.longitude)
+        batch.append(event)
+        if len(batch) >= 500:
+            Event.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0003_event_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Вычисляется из координат при сохранении",
+                max_length=12,
+                verbose_name="Geohash",
+            ),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
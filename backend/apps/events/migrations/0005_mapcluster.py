@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0004_event_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MapCluster",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "precision",
+                    models.PositiveSmallIntegerField(verbose_name="Точность geohash"),
+                ),
+                ("cell", models.CharField(max_length=12, verbose_name="Ячейка")),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество мероприятий"
+                    ),
+                ),
+                (
+                    "latitude_sum",
+                    models.FloatField(default=0, verbose_name="Сумма широт"),
+                ),
+                (
+                    "longitude_sum",
+                    models.FloatField(default=0, verbose_name="Сумма долгот"),
+                ),
+                (
+                    "category_counts",
+                    models.JSONField(
+                        default=dict, verbose_name="Мероприятий по категориям"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Кластер карты",
+                "verbose_name_plural": "Кластеры карты",
+                "unique_together": {("precision", "cell")},
+            },
+        ),
+    ]
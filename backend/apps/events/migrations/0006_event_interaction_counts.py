@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_interaction_counts(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    UserEventInteraction = apps.get_model("events", "UserEventInteraction")
+
+    rows = UserEventInteraction.objects.values("event_id").annotate(
+        interested_count=Count("id", filter=Q(interaction_type="interested")),
+        going_count=Count("id", filter=Q(interaction_type="going")),
+    )
+    for row in rows:
+        Event.objects.filter(pk=row.pop("event_id")).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0005_mapcluster"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="going_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Пойдут"),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="interested_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Интересно"),
+        ),
+        migrations.RunPython(backfill_interaction_counts, migrations.RunPython.noop),
+    ]
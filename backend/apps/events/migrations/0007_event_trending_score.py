@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0006_event_interaction_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="trending_score",
+            field=models.FloatField(
+                default=0, editable=False, verbose_name="Популярность"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["-trending_score"], name="event_trending_idx"),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0007_event_trending_score"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventSimilarity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Сходство")),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_links",
+                        to="events.event",
+                        verbose_name="Мероприятие",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_to_links",
+                        to="events.event",
+                        verbose_name="Похожее мероприятие",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Похожее мероприятие",
+                "verbose_name_plural": "Похожие мероприятия",
+                "indexes": [
+                    models.Index(
+                        fields=["event", "-score"], name="event_similarity_idx"
+                    )
+                ],
+                "unique_together": {("event", "similar")},
+            },
+        ),
+    ]
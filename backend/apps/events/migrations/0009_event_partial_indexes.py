@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0008_eventsimilarity"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="event",
+            name="events_even_start_d_577769_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="event",
+            name="events_even_categor_f85a11_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="event",
+            name="event_trending_idx",
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["start_date", "city"],
+                name="event_upcoming_date_city_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["category", "start_date"],
+                name="event_upcoming_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-trending_score"],
+                name="event_trending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0009_event_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CounterFlush",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(max_length=100, unique=True, verbose_name="Буфер"),
+                ),
+                (
+                    "flush_id",
+                    models.CharField(
+                        blank=True, max_length=32, verbose_name="Идентификатор переноса"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Перенос счетчика",
+                "verbose_name_plural": "Переносы счетчиков",
+            },
+        ),
+    ]
@@ -1,7 +1,12 @@
-from django.db import models
+from collections import defaultdict
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models import Avg
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.utils import timezone
+from utils.geo import geohash_encode
 
 class Category(models.Model):
     """Категории мероприятий"""
@@ -38,6 +43,13 @@ class Event(models.Model):
         ('completed', 'Завершено'),
     ]
     
+    # Статусы, видимые в API: прошедшие мероприятия переводятся в completed
+    # (задача complete_past_events) и доступны с show_past=true
+    VISIBLE_STATUSES = ['published', 'completed']
+    
+    # Мероприятий в одной транзакции перевода в completed
+    COMPLETE_BATCH_SIZE = 1000
+    
     # Основная информация
     title = models.CharField('Название', max_length=200)
     slug = models.SlugField('Слаг', unique=True, blank=True)
@@ -65,6 +77,10 @@ class Event(models.Model):
     latitude = models.DecimalField('Широта', max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField('Долгота', max_digits=9, decimal_places=6, null=True, blank=True)
     venue_name = models.CharField('Название места', max_length=200, blank=True)
+    geohash = models.CharField(
+        'Geohash', max_length=12, blank=True, db_index=True, editable=False,
+        help_text='Вычисляется из координат при сохранении'
+    )
     
     # Организатор
     organizer = models.CharField('Организатор', max_length=200)
@@ -117,35 +133,301 @@ class Event(models.Model):
     created_at = models.DateTimeField('Дата создания', auto_now_add=True)
     updated_at = models.DateTimeField('Дата обновления', auto_now=True)
     
+    # Полнотекстовый поиск (заполняется триггером БД, см. миграцию 0003)
+    search_vector = SearchVectorField('Поисковый вектор', null=True, editable=False)
+    
     # Счетчики
     views_count = models.PositiveIntegerField('Количество просмотров', default=0)
     
+    # Агрегаты одобренных отзывов (поддерживаются сигналами apps.reviews)
+    reviews_count = models.PositiveIntegerField('Количество отзывов', default=0)
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0)
+    rating_1_count = models.PositiveIntegerField('Оценок 1', default=0)
+    rating_2_count = models.PositiveIntegerField('Оценок 2', default=0)
+    rating_3_count = models.PositiveIntegerField('Оценок 3', default=0)
+    rating_4_count = models.PositiveIntegerField('Оценок 4', default=0)
+    rating_5_count = models.PositiveIntegerField('Оценок 5', default=0)
+    
+    RATING_AGGREGATE_FIELDS = [
+        'reviews_count', 'rating_sum', 'rating_1_count', 'rating_2_count',
+        'rating_3_count', 'rating_4_count', 'rating_5_count',
+    ]
+    
+    # Счетчики отметок пользователей (поддерживаются views при изменении отметок)
+    interested_count = models.PositiveIntegerField('Интересно', default=0)
+    going_count = models.PositiveIntegerField('Пойдут', default=0)
+    
+    INTERACTION_COUNT_FIELDS = ['interested_count', 'going_count']
+    
+    # Популярность с затуханием (см. apps.events.trending), 0 — не было активности
+    trending_score = models.FloatField('Популярность', default=0, editable=False)
+    
     class Meta:
         verbose_name = 'Мероприятие'
         verbose_name_plural = 'Мероприятия'
         ordering = ['start_date', 'start_time']
+        # Индексы горячих запросов — частичные, только по опубликованным
+        # (предстоящим) мероприятиям: завершенные из них выбывают
         indexes = [
-            models.Index(fields=['start_date', 'city']),
-            models.Index(fields=['category', 'status']),
+            models.Index(
+                fields=['start_date', 'city'], condition=Q(status='published'),
+                name='event_upcoming_date_city_idx'
+            ),
+            models.Index(
+                fields=['category', 'start_date'], condition=Q(status='published'),
+                name='event_upcoming_category_idx'
+            ),
             models.Index(fields=['slug']),
+            GinIndex(fields=['search_vector'], name='event_search_vector_idx'),
+            GinIndex(fields=['title'], name='event_title_trgm_idx', opclasses=['gin_trgm_ops']),
+            models.Index(
+                fields=['-trending_score'], condition=Q(status='published'),
+                name='event_trending_idx'
+            ),
         ]
     
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        """Пересчитываем geohash по координатам"""
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geohash_encode(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
+        super().save(*args, **kwargs)
+    
     def get_average_rating(self):
-        """Возвращает средний рейтинг мероприятия"""
-        avg = self.reviews.aggregate(Avg('rating'))['rating__avg']
-        return round(avg, 1) if avg else 0
+        """Возвращает средний рейтинг мероприятия (по одобренным отзывам)"""
+        if not self.reviews_count:
+            return 0
+        return round(self.rating_sum / self.reviews_count, 1)
     
     def get_reviews_count(self):
-        """Возвращает количество отзывов"""
-        return self.reviews.count()
+        """Возвращает количество одобренных отзывов"""
+        return self.reviews_count
+    
+    def get_rating_histogram(self):
+        """Возвращает распределение оценок {1: n, ..., 5: n}"""
+        return {
+            rating: getattr(self, f'rating_{rating}_count')
+            for rating in range(1, 6)
+        }
+    
+    @classmethod
+    def apply_review_delta(cls, event_id, rating, delta):
+        """
+        Атомарно добавляет (delta=1) или вычитает (delta=-1) одобренный
+        отзыв с оценкой rating из агрегатов мероприятия
+        """
+        from . import trending
+        from .cache import invalidate
+        
+        histogram_field = f'rating_{rating}_count'
+        cls.objects.filter(pk=event_id).update(**{
+            'reviews_count': F('reviews_count') + delta,
+            'rating_sum': F('rating_sum') + delta * rating,
+            histogram_field: F(histogram_field) + delta,
+            'updated_at': timezone.now(),
+        })
+        invalidate()
+        if delta > 0:
+            trending.record(event_id, 'review')
+    
+    @classmethod
+    def recalculate_ratings(cls, event_ids=None):
+        """
+        Пересчитывает агрегаты отзывов с нуля одним сгруппированным запросом.
+        Используется массовыми действиями админки и командой recalculate_ratings.
+        
+        Args:
+            event_ids: список ID мероприятий (None — все мероприятия)
+        
+        Returns:
+            количество обновленных мероприятий
+        """
+        from apps.reviews.models import Review
+        
+        reviews = Review.objects.filter(status='approved')
+        events = cls.objects.all()
+        if event_ids is not None:
+            reviews = reviews.filter(event_id__in=event_ids)
+            events = events.filter(pk__in=event_ids)
+        
+        aggregates = {
+            row.pop('event_id'): row
+            for row in reviews.values('event_id').annotate(
+                reviews_count=Count('id'),
+                rating_sum=Sum('rating'),
+                **{
+                    f'rating_{rating}_count': Count('id', filter=Q(rating=rating))
+                    for rating in range(1, 6)
+                }
+            )
+        }
+        return cls._sync_aggregates(events, cls.RATING_AGGREGATE_FIELDS, aggregates)
+    
+    @classmethod
+    def apply_interaction_delta(cls, event_id, interaction_type, delta):
+        """
+        Атомарно добавляет (delta=1) или вычитает (delta=-1) отметку
+        interaction_type ('interested' / 'going') в счетчиках мероприятия
+        
+        Кэш списков не сбрасывается: счетчики в нем обновятся вместе
+        с кэшем, как и просмотры.
+        """
+        from . import trending
+        
+        counter_field = f'{interaction_type}_count'
+        cls.objects.filter(pk=event_id).update(**{
+            counter_field: F(counter_field) + delta,
+            'updated_at': timezone.now(),
+        })
+        if delta > 0:
+            trending.record(event_id, interaction_type)
+    
+    @classmethod
+    def apply_interaction_deltas(cls, deltas):
+        """
+        Изменение счетчиков отметок нескольких мероприятий одним UPDATE
+        
+        Args:
+            deltas: {(event_id, interaction_type): delta}
+        """
+        from . import trending
+        
+        updates = {}
+        for interaction_type in ('interested', 'going'):
+            cases = [
+                When(pk=event_id, then=Value(delta))
+                for (event_id, item_type), delta in deltas.items()
+                if item_type == interaction_type and delta
+            ]
+            if cases:
+                counter_field = f'{interaction_type}_count'
+                updates[counter_field] = F(counter_field) + Case(
+                    *cases, default=Value(0), output_field=models.IntegerField()
+                )
+        
+        if updates:
+            event_ids = {event_id for (event_id, _), delta in deltas.items() if delta}
+            cls.objects.filter(pk__in=event_ids).update(**updates, updated_at=timezone.now())
+        
+        weights = defaultdict(float)
+        for (event_id, interaction_type), delta in deltas.items():
+            if delta > 0:
+                weights[event_id] += trending.WEIGHTS[interaction_type] * delta
+        trending.record_many(weights)
+    
+    @classmethod
+    def recalculate_interaction_counts(cls, event_ids=None):
+        """
+        Пересчитывает счетчики отметок с нуля одним сгруппированным запросом
+        (исправляет расхождения, задача reconcile_interaction_counts)
+        
+        Args:
+            event_ids: список ID мероприятий (None — все мероприятия)
+        
+        Returns:
+            количество обновленных мероприятий
+        """
+        interactions = UserEventInteraction.objects.all()
+        events = cls.objects.all()
+        if event_ids is not None:
+            interactions = interactions.filter(event_id__in=event_ids)
+            events = events.filter(pk__in=event_ids)
+        
+        aggregates = {
+            row.pop('event_id'): row
+            for row in interactions.values('event_id').annotate(
+                interested_count=Count('id', filter=Q(interaction_type='interested')),
+                going_count=Count('id', filter=Q(interaction_type='going')),
+            )
+        }
+        return cls._sync_aggregates(events, cls.INTERACTION_COUNT_FIELDS, aggregates)
+    
+    @classmethod
+    def _sync_aggregates(cls, events, fields, aggregates):
+        """
+        Записывает пересчитанные значения fields мероприятий пачками bulk_update
+        (только изменившиеся мероприятия)
+        
+        Args:
+            aggregates: {event_id: {field: value}}; отсутствующие — нули
+        
+        Returns:
+            количество обновленных мероприятий
+        """
+        from .cache import invalidate
+        
+        empty = dict.fromkeys(fields, 0)
+        now = timezone.now()
+        changed = []
+        updated_count = 0
+        for event in events.only('pk', *fields).iterator(chunk_size=2000):
+            values = aggregates.get(event.pk, empty)
+            if any(getattr(event, field) != values[field] for field in fields):
+                for field in fields:
+                    setattr(event, field, values[field])
+                event.updated_at = now
+                changed.append(event)
+            
+            if len(changed) >= 500:
+                cls.objects.bulk_update(changed, fields + ['updated_at'])
+                updated_count += len(changed)
+                changed = []
+        
+        if changed:
+            cls.objects.bulk_update(changed, fields + ['updated_at'])
+            updated_count += len(changed)
+        
+        if updated_count:
+            invalidate()
+        return updated_count
+    
+    @classmethod
+    def complete_past(cls, batch_size=None):
+        """
+        Переводит прошедшие опубликованные мероприятия (закончились до
+        сегодняшнего дня) в статус completed пачками по batch_size,
+        каждая пачка — отдельной короткой транзакцией
+        
+        Returns:
+            количество завершенных мероприятий
+        """
+        from .cache import invalidate
+        
+        batch_size = batch_size or cls.COMPLETE_BATCH_SIZE
+        today = timezone.now().date()
+        past = cls.objects.filter(
+            Q(end_date__isnull=True) | Q(end_date__lt=today),
+            status='published',
+            start_date__lt=today,
+        )
+        
+        completed_count = 0
+        while True:
+            event_ids = list(past.order_by('start_date').values_list('pk', flat=True)[:batch_size])
+            if not event_ids:
+                break
+            with transaction.atomic():
+                completed_count += cls.objects.filter(pk__in=event_ids, status='published').update(
+                    status='completed', updated_at=timezone.now()
+                )
+        
+        if completed_count:
+            invalidate()
+        return completed_count
     
     def increment_views(self):
-        """Увеличивает счетчик просмотров"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """Атомарно увеличивает счетчик просмотров в БД (без буферизации)"""
+        Event.objects.filter(pk=self.pk).update(views_count=F('views_count') + 1)
+        if 'views_count' not in self.get_deferred_fields():
+            self.views_count += 1
 
 
 class UserEventInteraction(models.Model):
@@ -177,4 +459,99 @@ class UserEventInteraction(models.Model):
         unique_together = ['user', 'event', 'interaction_type']
     
     def __str__(self):
-        return f'{self.user.username} - {self.event.title} ({self.get_interaction_type_display()})'
\ No newline at end of file
+        return f'{self.user.username} - {self.event.title} ({self.get_interaction_type_display()})'
+    
+    @classmethod
+    def get_user_map(cls, user, event_ids):
+        """
+        Отметки пользователя для набора мероприятий одним запросом
+        
+        Returns:
+            {event_id: [interaction_type, ...]} (типы по алфавиту)
+        """
+        result = {}
+        interactions = cls.objects.filter(
+            user=user, event_id__in=list(event_ids)
+        ).order_by('interaction_type').values_list('event_id', 'interaction_type')
+        for event_id, interaction_type in interactions:
+            result.setdefault(event_id, []).append(interaction_type)
+        return result
+
+class MapCluster(models.Model):
+    """
+    Предрасчитанный кластер мероприятий для карты
+
+    Ячейка — префикс geohash длины precision; уровни пирамиды соответствуют
+    уровням масштаба карты (см. apps.events.clusters.ZOOM_PRECISION).
+    Учитываются только предстоящие опубликованные мероприятия с координатами.
+    """
+    
+    precision = models.PositiveSmallIntegerField('Точность geohash')
+    cell = models.CharField('Ячейка', max_length=12)
+    count = models.PositiveIntegerField('Количество мероприятий', default=0)
+    latitude_sum = models.FloatField('Сумма широт', default=0)
+    longitude_sum = models.FloatField('Сумма долгот', default=0)
+    category_counts = models.JSONField('Мероприятий по категориям', default=dict)
+    
+    class Meta:
+        verbose_name = 'Кластер карты'
+        verbose_name_plural = 'Кластеры карты'
+        unique_together = ['precision', 'cell']
+    
+    def __str__(self):
+        return f'{self.cell} ({self.count})'
+
+
+class EventSimilarity(models.Model):
+    """
+    Предрасчитанный ближайший сосед мероприятия по тексту
+
+    Для каждого предстоящего опубликованного мероприятия хранится не больше
+    SIMILAR_LIMIT соседей (см. apps.events.similarity).
+    """
+    
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='similar_links',
+        verbose_name='Мероприятие'
+    )
+    similar = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='similar_to_links',
+        verbose_name='Похожее мероприятие'
+    )
+    score = models.FloatField('Сходство')
+    
+    class Meta:
+        verbose_name = 'Похожее мероприятие'
+        verbose_name_plural = 'Похожие мероприятия'
+        unique_together = ['event', 'similar']
+        indexes = [
+            models.Index(fields=['event', '-score'], name='event_similarity_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.event_id} -> {self.similar_id} ({self.score:.3f})'
+
+
+class CounterFlush(models.Model):
+    """
+    Последний перенесенный в БД буфер счетчика из Redis
+
+    Идентификатор переноса записывается в одной транзакции с UPDATE
+    счетчиков, поэтому буфер, оставшийся в Redis после сбоя, повторно не
+    применяется (просмотры и рейтинг популярности, см.
+    apps.events.counters.mark_flushed).
+    """
+    
+    key = models.CharField('Буфер', max_length=100, unique=True)
+    flush_id = models.CharField('Идентификатор переноса', max_length=32, blank=True)
+    
+    class Meta:
+        verbose_name = 'Перенос счетчика'
+        verbose_name_plural = 'Переносы счетчиков'
+    
+    def __str__(self):
+        return f'{self.key}: {self.flush_id}'
@@ -0,0 +1,270 @@
+"""
+Персональные рекомендации мероприятий
+
+Списки кандидатов считаются ночью (задача rebuild_recommendations):
+
+- сходство мероприятий по совместным отметкам: матрица пользователь ×
+  мероприятие X (отметки и одобренные отзывы с высокой оценкой) с
+  нормированными столбцами, S = Xᵀ·X — косинусная мера совместной
+  встречаемости, разреженная (scipy.sparse);
+- оценка предстоящего мероприятия для пользователя — сумма сходства с
+  его мероприятиями (X_u·S, нормирована к [0, 1]), совпадений с
+  интересами (CustomUser.interests), своего города и популярности.
+
+Топ-K id для каждого пользователя кэшируется одним ключом, поэтому
+запрос /events/recommended/ — одно чтение кэша и одна выборка
+мероприятий. Пользователи без ночного списка (новые) до следующего
+пересчета получают общий список по популярности.
+"""
+import re
+from collections import defaultdict
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
+from django.utils import timezone
+from .models import Event, UserEventInteraction
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+USER_KEY = 'events:recommended:user:{}'
+DEFAULT_KEY = 'events:recommended:default'
+
+# Ночной список живет до следующего пересчета с запасом
+REBUILD_TIMEOUT = 60 * 60 * 36
+# Список популярных, выбранный при отсутствии ночного общего, — до часа
+LIVE_TIMEOUT = 60 * 60
+
+# Сколько id хранится для пользователя (часть отсеется: прошедшие, отмеченные)
+STORED_LIMIT = 100
+
+# Веса сигналов в матрице пользователь × мероприятие
+INTERACTION_WEIGHTS = {
+    'interested': 1.0,
+    'going': 2.0,
+}
+REVIEW_WEIGHT = 2.0
+REVIEW_MIN_RATING = 4
+
+# Веса слагаемых оценки кандидата
+COOCCURRENCE_WEIGHT = 3.0
+INTEREST_WEIGHT = 2.0
+CITY_WEIGHT = 1.0
+POPULARITY_WEIGHT = 0.5
+
+# Длина основы слова при сравнении интересов (грубо отбрасывает окончания)
+STEM_LENGTH = 5
+
+USERS_PER_WRITE = 500
+
+
+def _require_numpy():
+    if np is None:
+        raise ImproperlyConfigured('Для рекомендаций нужны пакеты numpy и scipy')
+
+
+def _stems(text):
+    return [word[:STEM_LENGTH] for word in re.findall(r'\w{3,}', text.lower())]
+
+
+def _city_key(city):
+    return city.strip().lower()
+
+
+def _split_interests(interests):
+    """Интересы из строки через запятую (как CustomUser.get_interests_list)"""
+    return [interest.strip() for interest in interests.split(',') if interest.strip()]
+
+
+class Candidates:
+    """
+    Предстоящие опубликованные мероприятия — кандидаты в рекомендации
+
+    Индекс i в массивах соответствует ids[i].
+    """
+
+    def __init__(self):
+        _require_numpy()
+        rows = list(Event.objects.filter(
+            status='published', start_date__gte=timezone.now().date()
+        ).order_by('id').values_list('id', 'title', 'city', 'category__name', 'trending_score'))
+
+        self.ids = [row[0] for row in rows]
+        self.positions = {event_id: index for index, event_id in enumerate(self.ids)}
+
+        # Популярность — ранг по trending_score, нормированный к [0, 1]
+        scores = np.array([row[4] for row in rows], dtype=float)
+        ranks = scores.argsort().argsort()
+        self.popularity = ranks / max(len(rows) - 1, 1)
+        self.popularity[scores == 0] = 0
+
+        self.cities = defaultdict(list)
+        self.words = defaultdict(set)
+        for index, (event_id, title, city, category_name, score) in enumerate(rows):
+            self.cities[_city_key(city)].append(index)
+            for stem in _stems(f'{title} {category_name or ""}'):
+                self.words[stem].add(index)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def base_scores(self, city='', interests=()):
+        """Оценки по популярности, городу и интересам пользователя"""
+        scores = POPULARITY_WEIGHT * self.popularity
+        if city:
+            scores[self.cities.get(_city_key(city), [])] += CITY_WEIGHT
+        for interest in interests:
+            stems = _stems(interest)
+            if not stems:
+                continue
+            matches = set.intersection(*(self.words.get(stem, set()) for stem in stems))
+            if matches:
+                scores[list(matches)] += INTEREST_WEIGHT
+        return scores
+
+    def top(self, scores, exclude=()):
+        """id мероприятий с наибольшими оценками (не больше STORED_LIMIT)"""
+        scores = scores.copy()
+        scores[list(exclude)] = -np.inf
+        limit = min(STORED_LIMIT, len(scores))
+        if not limit:
+            return []
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [self.ids[index] for index in best if scores[index] > 0]
+
+
+def _signal_matrix():
+    """
+    Разреженная матрица пользователь × мероприятие по отметкам и одобренным
+    отзывам с высокой оценкой
+
+    Returns:
+        (матрица CSR, список user_id строк, список event_id столбцов)
+    """
+    from apps.reviews.models import Review
+
+    weights = defaultdict(float)
+    interactions = UserEventInteraction.objects.values_list('user_id', 'event_id', 'interaction_type')
+    for user_id, event_id, interaction_type in interactions.iterator(chunk_size=5000):
+        weights[user_id, event_id] += INTERACTION_WEIGHTS[interaction_type]
+    reviews = Review.objects.filter(
+        status='approved', rating__gte=REVIEW_MIN_RATING
+    ).values_list('user_id', 'event_id')
+    for user_id, event_id in reviews.iterator(chunk_size=5000):
+        weights[user_id, event_id] += REVIEW_WEIGHT
+
+    user_ids = sorted({user_id for user_id, _ in weights})
+    event_ids = sorted({event_id for _, event_id in weights})
+    user_index = {user_id: index for index, user_id in enumerate(user_ids)}
+    event_index = {event_id: index for index, event_id in enumerate(event_ids)}
+
+    matrix = sparse.csr_matrix(
+        (
+            np.fromiter(weights.values(), dtype=float, count=len(weights)),
+            (
+                np.fromiter((user_index[user_id] for user_id, _ in weights), dtype=np.int64, count=len(weights)),
+                np.fromiter((event_index[event_id] for _, event_id in weights), dtype=np.int64, count=len(weights)),
+            ),
+        ),
+        shape=(len(user_ids), len(event_ids)),
+    )
+    return matrix, user_ids, event_ids
+
+
+def _cooccurrence_scores(matrix, event_ids, candidates):
+    """
+    Сходство кандидатов с мероприятиями каждого пользователя: X·S,
+    S = Xₙᵀ·Xₙ[:, кандидаты], Xₙ — X с единичными столбцами.
+    Строки нормированы к [0, 1].
+    """
+    if not matrix.shape[0] or not len(candidates):
+        # Нет сигналов или нет предстоящих мероприятий: оценок нет
+        return sparse.csr_matrix((matrix.shape[0], len(candidates)))
+
+    columns = [index for index, event_id in enumerate(event_ids) if event_id in candidates.positions]
+    targets = [candidates.positions[event_ids[index]] for index in columns]
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0))).ravel()
+    normalized = matrix @ sparse.diags(1 / np.where(norms > 0, norms, 1))
+    similarity = normalized.T @ normalized[:, columns]
+
+    scores = (matrix @ similarity).tocsr()
+    # Столбцы — позиции кандидатов
+    scores = sparse.csr_matrix(
+        (scores.data, np.asarray(targets, dtype=np.int64)[scores.indices], scores.indptr),
+        shape=(matrix.shape[0], len(candidates)),
+    )
+    row_max = np.asarray(scores.max(axis=1).todense()).ravel()
+    return (sparse.diags(1 / np.where(row_max > 0, row_max, 1)) @ scores).tocsr()
+
+
+def rebuild():
+    """
+    Пересчет списков рекомендаций для всех пользователей с сигналами
+    (отметки, отзывы, интересы или город)
+
+    Returns:
+        количество пользователей с сохраненным списком
+    """
+    candidates = Candidates()
+    matrix, signal_users, event_ids = _signal_matrix()
+    cooccurrence = _cooccurrence_scores(matrix, event_ids, candidates)
+    rows = {user_id: index for index, user_id in enumerate(signal_users)}
+
+    cache.set(DEFAULT_KEY, candidates.top(candidates.base_scores()), timeout=REBUILD_TIMEOUT)
+
+    users = get_user_model().objects.filter(
+        Q(pk__in=signal_users) | ~Q(interests='') | ~Q(city=''), is_active=True
+    ).values_list('pk', 'city', 'interests')
+
+    stored = 0
+    batch = {}
+    for user_id, city, interests in users.iterator(chunk_size=2000):
+        scores = candidates.base_scores(city, _split_interests(interests))
+        exclude = ()
+        if user_id in rows:
+            row = rows[user_id]
+            related = cooccurrence[row]
+            scores[related.indices] += COOCCURRENCE_WEIGHT * related.data
+            seen = matrix[row].indices
+            exclude = [
+                candidates.positions[event_ids[index]] for index in seen
+                if event_ids[index] in candidates.positions
+            ]
+
+        batch[USER_KEY.format(user_id)] = candidates.top(scores, exclude)
+        if len(batch) >= USERS_PER_WRITE:
+            cache.set_many(batch, timeout=REBUILD_TIMEOUT)
+            stored += len(batch)
+            batch = {}
+    cache.set_many(batch, timeout=REBUILD_TIMEOUT)
+    return stored + len(batch)
+
+
+def _popular_ids():
+    """Предстоящие мероприятия по популярности (частичный индекс event_trending_idx)"""
+    return list(Event.objects.filter(
+        status='published', start_date__gte=timezone.now().date(), trending_score__gt=0
+    ).order_by('-trending_score', 'id').values_list('id', flat=True)[:STORED_LIMIT])
+
+
+def for_user(user):
+    """
+    id рекомендованных мероприятий по убыванию оценки
+
+    Ночной список пользователя из кэша; если его нет (новый пользователь,
+    список появится после ночного пересчета) — общий ночной список, а без
+    него — популярные мероприятия. Кандидаты в запросе не пересчитываются.
+    """
+    event_ids = cache.get_many([USER_KEY.format(user.pk), DEFAULT_KEY])
+    if event_ids:
+        return event_ids.get(USER_KEY.format(user.pk), event_ids.get(DEFAULT_KEY))
+
+    event_ids = _popular_ids()
+    cache.set(DEFAULT_KEY, event_ids, timeout=LIVE_TIMEOUT)
+    return event_ids
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from utils.fieldsets import SparseFieldsetsMixin
 from .models import Event, Category, UserEventInteraction
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -9,12 +10,43 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'description', 'icon']
 
 
-class EventListSerializer(serializers.ModelSerializer):
+RATING_FIELD_DEPENDENCIES = {
+    'average_rating': ['reviews_count', 'rating_sum'],
+    'rating_histogram': [f'rating_{rating}_count' for rating in range(1, 6)],
+}
+
+
+class UserInteractionMixin:
+    """
+    Поле user_interaction: отметки текущего пользователя (interested/going)
+    
+    Берутся из context['user_interactions'] ({event_id: [типы]}), который
+    view заполняет одним запросом на всю страницу; без него выполняется
+    запрос на каждое мероприятие. Для анонимного пользователя — пустой
+    список без запросов.
+    """
+    
+    def get_user_interaction(self, obj):
+        """Возвращает взаимодействия текущего пользователя с мероприятием"""
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return []
+        
+        interactions = self.context.get('user_interactions')
+        if interactions is None:
+            interactions = UserEventInteraction.get_user_map(request.user, [obj.pk])
+        return interactions.get(obj.pk, [])
+
+
+class EventListSerializer(UserInteractionMixin, SparseFieldsetsMixin, serializers.ModelSerializer):
     """Сериализатор для списка мероприятий (краткая информация)"""
     
+    sparse_field_dependencies = RATING_FIELD_DEPENDENCIES
+    
     category_name = serializers.CharField(source='category.name', read_only=True)
-    average_rating = serializers.SerializerMethodField()
-    reviews_count = serializers.SerializerMethodField()
+    average_rating = serializers.ReadOnlyField(source='get_average_rating')
+    search_headline = serializers.SerializerMethodField()
+    user_interaction = serializers.SerializerMethodField()
     
     class Meta:
         model = Event
@@ -23,22 +55,31 @@ class EventListSerializer(serializers.ModelSerializer):
             'start_date', 'start_time', 'city', 'address', 'venue_name',
             'category', 'category_name', 'is_free', 'price_min', 'price_max',
             'age_restriction', 'average_rating', 'reviews_count',
-            'views_count', 'is_featured'
+            'views_count', 'interested_count', 'going_count', 'is_featured',
+            'search_headline', 'user_interaction'
         ]
     
-    def get_average_rating(self, obj):
-        return obj.get_average_rating()
+    def get_fields(self):
+        """search_headline есть в ответе только при поиске (?search=)"""
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or not request.query_params.get('search', '').strip():
+            fields.pop('search_headline', None)
+        return fields
     
-    def get_reviews_count(self, obj):
-        return obj.get_reviews_count()
+    def get_search_headline(self, obj):
+        """Фрагмент описания с подсветкой найденных слов"""
+        return getattr(obj, 'search_headline', None)
 
 
-class EventDetailSerializer(serializers.ModelSerializer):
+class EventDetailSerializer(UserInteractionMixin, SparseFieldsetsMixin, serializers.ModelSerializer):
     """Сериализатор для детального просмотра мероприятия"""
     
+    sparse_field_dependencies = RATING_FIELD_DEPENDENCIES
+    
     category_name = serializers.CharField(source='category.name', read_only=True)
-    average_rating = serializers.SerializerMethodField()
-    reviews_count = serializers.SerializerMethodField()
+    average_rating = serializers.ReadOnlyField(source='get_average_rating')
+    rating_histogram = serializers.ReadOnlyField(source='get_rating_histogram')
     user_interaction = serializers.SerializerMethodField()
     
     class Meta:
@@ -51,26 +92,10 @@ class EventDetailSerializer(serializers.ModelSerializer):
             'organizer_phone', 'organizer_website', 'is_free',
             'price_min', 'price_max', 'ticket_url', 'age_restriction',
             'image', 'video_url', 'status', 'is_featured',
-            'average_rating', 'reviews_count', 'views_count',
+            'average_rating', 'reviews_count', 'rating_histogram', 'views_count',
+            'interested_count', 'going_count',
             'created_at', 'updated_at', 'user_interaction'
         ]
-    
-    def get_average_rating(self, obj):
-        return obj.get_average_rating()
-    
-    def get_reviews_count(self, obj):
-        return obj.get_reviews_count()
-    
-    def get_user_interaction(self, obj):
-        """Возвращает взаимодействия текущего пользователя с мероприятием"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            interactions = UserEventInteraction.objects.filter(
-                user=request.user,
-                event=obj
-            ).values_list('interaction_type', flat=True)
-            return list(interactions)
-        return []
 
 
 class EventCreateUpdateSerializer(serializers.ModelSerializer):
@@ -112,4 +137,12 @@ class UserEventInteractionSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserEventInteraction
         fields = ['id', 'event', 'event_detail', 'interaction_type', 'created_at']
-        read_only_fields = ['created_at']
\ No newline at end of file
+        read_only_fields = ['created_at']
+
+
+class BulkInteractionSerializer(serializers.Serializer):
+    """Элемент запроса PUT /interactions/bulk/"""
+    
+    event = serializers.IntegerField(min_value=1)
+    interaction_type = serializers.ChoiceField(choices=UserEventInteraction.INTERACTION_CHOICES)
+    state = serializers.BooleanField()
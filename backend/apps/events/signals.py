@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from . import cache, calendar_counts, clusters, similarity
+from .models import Event, Category
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_event_list_cache(sender, **kwargs):
+    """Изменение мероприятия или категории сбрасывает кэш списков"""
+    cache.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_validators(sender, **kwargs):
+    """Изменение категории меняет ETag списка категорий и названия в кластерах карты"""
+    cache.invalidate(cache.CATEGORY_VERSION_KEY)
+    cache.invalidate(clusters.CLUSTER_VERSION_KEY)
+
+
+@receiver(pre_save, sender=Event)
+def remember_cluster_contribution(sender, instance, raw=False, **kwargs):
+    """Запоминаем вклад мероприятия в кластеры карты до сохранения"""
+    if raw:
+        return
+    instance._previous_cluster_contribution = clusters.snapshot(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=Event)
+def update_map_clusters_on_save(sender, instance, raw=False, **kwargs):
+    """Перемещение, публикация или снятие мероприятия обновляет кластеры карты"""
+    if raw:
+        return
+    current = clusters.event_contribution(
+        instance.geohash, instance.latitude, instance.longitude,
+        instance.category_id, instance.status, instance.start_date
+    )
+    clusters.apply_change(getattr(instance, '_previous_cluster_contribution', None), current)
+
+
+@receiver(post_delete, sender=Event)
+def update_map_clusters_on_delete(sender, instance, **kwargs):
+    clusters.apply_change(
+        clusters.event_contribution(
+            instance.geohash, instance.latitude, instance.longitude,
+            instance.category_id, instance.status, instance.start_date
+        ),
+        None
+    )
+
+
+@receiver([post_save, post_delete], sender=Event)
+def update_similar_events(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Изменение текста, категории, статуса или даты ставит мероприятие в очередь пересчета похожих"""
+    if raw or (update_fields is not None and not similarity.SOURCE_FIELDS & set(update_fields)):
+        return
+    event_id = instance.pk
+    transaction.on_commit(lambda: similarity.mark_changed(event_id))
+
+
+@receiver(pre_save, sender=Event)
+def remember_calendar_span(sender, instance, raw=False, **kwargs):
+    """Запоминаем даты мероприятия до сохранения (для сброса кэша календаря)"""
+    if raw or not instance.pk:
+        instance._previous_calendar_span = None
+        return
+    instance._previous_calendar_span = Event.objects.filter(pk=instance.pk).values_list(
+        'start_date', 'end_date'
+    ).first()
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_calendar(sender, instance, raw=False, **kwargs):
+    """Изменение мероприятия сбрасывает календарь месяцев, которые оно охватывало и охватывает"""
+    if raw:
+        return
+    previous = getattr(instance, '_previous_calendar_span', None)
+    if previous and previous[0]:
+        calendar_counts.invalidate_span(*previous)
+    if instance.start_date:
+        calendar_counts.invalidate_span(instance.start_date, instance.end_date)
@@ -0,0 +1,258 @@
+"""
+Похожие мероприятия по тексту
+
+Каждое предстоящее опубликованное мероприятие представляется вектором
+TF-IDF по хэшированным словам и парам слов из названия, краткого и
+полного описания и категории (поля с разными весами). Векторы нормированы,
+сходство — скалярное произведение, для каждого мероприятия в таблицу
+EventSimilarity записываются SIMILAR_LIMIT ближайших соседей.
+
+Ночью индекс (матрица векторов и веса IDF) строится заново и сохраняется
+в кэше. Сохранение мероприятия только добавляет его id в множество Redis;
+задача refresh_event_similarity раз в минуту забирает накопленные id,
+одним чтением и записью индекса обновляет их векторы и списки соседей
+мероприятий, для которых они входят или входили в соседи. IDF при этом
+не меняется до следующего ночного пересчета. Пересборка и пересчет
+выполняются под блокировкой Redis и не перезаписывают индекс друг друга.
+"""
+import math
+import re
+import zlib
+from collections import Counter
+import redis
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+from .counters import get_redis
+from .models import Event, EventSimilarity
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+INDEX_KEY = 'events:similarity:index'
+PENDING_KEY = 'events:similarity:pending'
+FLUSHING_KEY = 'events:similarity:flushing'
+LOCK_KEY = 'events:similarity:lock'
+
+# Блокировка снимается сама, если процесс с ней упал
+LOCK_TIMEOUT = 60 * 30
+# Сколько ночная пересборка ждет завершения текущего пересчета
+REBUILD_LOCK_WAIT = 60 * 10
+
+SIMILAR_LIMIT = 10
+MIN_SCORE = 0.05
+
+# Размерность хэшированного пространства признаков
+N_FEATURES = 2 ** 18
+
+# Вес признаков поля; категория — одним признаком
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'short_description': 1.5,
+    'description': 1.0,
+}
+CATEGORY_WEIGHT = 2.0
+
+# Поля, изменение которых меняет вектор или участие в индексе
+SOURCE_FIELDS = {'title', 'short_description', 'description', 'category', 'status', 'start_date'}
+
+ROWS_PER_PRODUCT = 1000
+
+
+def _require_numpy():
+    if np is None:
+        raise ImproperlyConfigured('Для похожих мероприятий нужны пакеты numpy и scipy')
+
+
+def _feature(token):
+    # crc32, а не hash(): номер признака не должен зависеть от процесса
+    return zlib.crc32(token.encode()) % N_FEATURES
+
+
+def _features(title, short_description, description, category_id):
+    """Взвешенные частоты признаков текста мероприятия {признак: вес}"""
+    counts = Counter()
+    for field, text in (
+        ('title', title), ('short_description', short_description), ('description', description)
+    ):
+        words = re.findall(r'\w{2,}', (text or '').lower())
+        tokens = words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+        for token, count in Counter(tokens).items():
+            counts[_feature(token)] += FIELD_WEIGHTS[field] * (1 + math.log(count))
+    if category_id:
+        counts[_feature(f'category:{category_id}')] += CATEGORY_WEIGHT
+    return counts
+
+
+def _source_rows(queryset):
+    return queryset.values_list('id', 'title', 'short_description', 'description', 'category_id')
+
+
+def _candidates():
+    return Event.objects.filter(status='published', start_date__gte=timezone.now().date())
+
+
+def _matrix(feature_rows, idf):
+    """Матрица нормированных векторов TF-IDF (строка — мероприятие)"""
+    data, indices, indptr = [], [], [0]
+    for counts in feature_rows:
+        indices.extend(counts)
+        data.extend(counts.values())
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=float), np.asarray(indices, dtype=np.int64), indptr),
+        shape=(len(feature_rows), N_FEATURES),
+    )
+    matrix = matrix @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1))).ravel()
+    return (sparse.diags(1 / np.where(norms > 0, norms, 1)) @ matrix).tocsr()
+
+
+def _neighbours(matrix, ids, rows):
+    """
+    Ближайшие соседи для строк rows матрицы: произведение разреженных
+    матриц частями по ROWS_PER_PRODUCT строк
+
+    Returns:
+        {event_id: [(similar_id, score), ...]}
+    """
+    result = {}
+    transposed = matrix.T.tocsc()
+    for start in range(0, len(rows), ROWS_PER_PRODUCT):
+        chunk = rows[start:start + ROWS_PER_PRODUCT]
+        scores = (matrix[chunk] @ transposed).tocsr()
+        for offset, row in enumerate(chunk):
+            begin, end = scores.indptr[offset], scores.indptr[offset + 1]
+            columns, values = scores.indices[begin:end], scores.data[begin:end]
+            keep = (values >= MIN_SCORE) & (columns != row)
+            columns, values = columns[keep], values[keep]
+            best = np.argsort(-values, kind='stable')[:SIMILAR_LIMIT]
+            result[ids[row]] = [(ids[columns[index]], float(values[index])) for index in best]
+    return result
+
+
+def _store(neighbours, replace_all=False):
+    """Заменяет соседей перечисленных мероприятий (или всю таблицу)"""
+    with transaction.atomic():
+        stale = EventSimilarity.objects.all()
+        if not replace_all:
+            stale = stale.filter(event_id__in=list(neighbours))
+        stale.delete()
+        EventSimilarity.objects.bulk_create([
+            EventSimilarity(event_id=event_id, similar_id=similar_id, score=score)
+            for event_id, pairs in neighbours.items()
+            for similar_id, score in pairs
+        ], batch_size=5000)
+
+
+def rebuild():
+    """
+    Полный пересчет индекса и соседей предстоящих мероприятий
+
+    Returns:
+        количество мероприятий в индексе
+    """
+    _require_numpy()
+    with get_redis().lock(LOCK_KEY, timeout=LOCK_TIMEOUT, blocking_timeout=REBUILD_LOCK_WAIT):
+        ids, feature_rows = [], []
+        for event_id, *source in _source_rows(_candidates()).iterator(chunk_size=2000):
+            ids.append(event_id)
+            feature_rows.append(_features(*source))
+
+        document_frequency = np.zeros(N_FEATURES)
+        for counts in feature_rows:
+            document_frequency[list(counts)] += 1
+        idf = np.log((1 + len(ids)) / (1 + document_frequency)) + 1
+
+        matrix = _matrix(feature_rows, idf)
+        neighbours = _neighbours(matrix, ids, list(range(len(ids))))
+
+        _store(neighbours, replace_all=True)
+        cache.set(INDEX_KEY, {'ids': ids, 'matrix': matrix, 'idf': idf}, timeout=None)
+    return len(ids)
+
+
+def mark_changed(event_id):
+    """Ставит мероприятие в очередь пересчета похожих (задача refresh_event_similarity)"""
+    try:
+        get_redis().sadd(PENDING_KEY, event_id)
+    except redis.RedisError:
+        pass  # Изменение учтет ночная пересборка
+
+
+def refresh():
+    """
+    Пересчет похожих для накопленных измененных мероприятий
+
+    Множество id атомарно переименовывается (новые изменения попадают в
+    новое); прерванный пересчет повторяется при следующем запуске. Если
+    блокировку держит пересборка, id дождутся следующего запуска.
+
+    Returns:
+        количество мероприятий с обновленными соседями
+    """
+    _require_numpy()
+    client = get_redis()
+    lock = client.lock(LOCK_KEY, timeout=LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        if not client.exists(FLUSHING_KEY):
+            try:
+                client.rename(PENDING_KEY, FLUSHING_KEY)
+            except redis.ResponseError:
+                return 0  # Изменений нет
+        updated_count = update_events(int(event_id) for event_id in client.smembers(FLUSHING_KEY))
+        client.delete(FLUSHING_KEY)
+        return updated_count
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:
+            pass  # Блокировка истекла
+
+
+def update_events(event_ids):
+    """
+    Обновление индекса после сохранения или удаления мероприятий
+
+    Векторы мероприятий пересчитываются (удаленные и больше не предстоящие
+    исключаются), затем пересчитываются соседи самих мероприятий и тех, у
+    которых они были или стали соседями. Без ночного индекса ничего не делает.
+
+    Returns:
+        количество мероприятий с обновленными соседями
+    """
+    index = cache.get(INDEX_KEY)
+    event_ids = set(event_ids)
+    if index is None or not event_ids:
+        return 0
+    ids, matrix, idf = index['ids'], index['matrix'], index['idf']
+
+    sources = {row[0]: row[1:] for row in _source_rows(_candidates().filter(pk__in=event_ids))}
+    affected = set(EventSimilarity.objects.filter(similar_id__in=event_ids).values_list('event_id', flat=True))
+    EventSimilarity.objects.filter(event_id__in=event_ids - set(sources)).delete()
+
+    # Строки измененных мероприятий убираются, актуальные векторы добавляются в конец
+    keep = [row for row, pk in enumerate(ids) if pk not in event_ids]
+    ids = [ids[row] for row in keep]
+    matrix = matrix[keep]
+    if sources:
+        vectors = _matrix([_features(*source) for source in sources.values()], idf)
+        ids = ids + list(sources)
+        matrix = sparse.vstack([matrix, vectors]).tocsr()
+        scores = (matrix @ vectors.T).tocoo()
+        affected.update(ids[row] for row, value in zip(scores.row, scores.data) if value >= MIN_SCORE)
+        affected.update(sources)
+
+    positions = {pk: row for row, pk in enumerate(ids)}
+    rows = sorted(positions[pk] for pk in affected if pk in positions)
+    neighbours = _neighbours(matrix, ids, rows) if rows else {}
+    _store(neighbours)
+
+    cache.set(INDEX_KEY, {'ids': ids, 'matrix': matrix, 'idf': idf}, timeout=None)
+    return len(neighbours)
@@ -1,5 +1,7 @@
 from celery import shared_task
 from .models import Event
+from .counters import flush_views
+from . import clusters, recommendations, similarity, trending
 from utils.yandex_afisha_api import YandexAfishaAPI
 
 @shared_task
@@ -10,4 +12,60 @@ def import_events_from_kudago():
         imported_count = api.import_events(city='msk', limit=50)
         return f"Импортировано событий: {imported_count}"
     except Exception as e:
-        return f"Ошибка импорта: {str(e)}"
\ No newline at end of file
+        return f"Ошибка импорта: {str(e)}"
+
+
+@shared_task
+def flush_event_views():
+    """Перенос накопленных в Redis просмотров в БД одним UPDATE"""
+    updated_count = flush_views()
+    return f"Обновлено счетчиков просмотров: {updated_count}"
+
+
+@shared_task
+def rebuild_map_clusters():
+    """Полная пересборка пирамиды кластеров карты (прошедшие мероприятия выбывают)"""
+    cluster_count = clusters.rebuild()
+    return f"Кластеров карты: {cluster_count}"
+
+
+@shared_task
+def reconcile_interaction_counts():
+    """Сверка счетчиков отметок interested/going с таблицей отметок"""
+    updated_count = Event.recalculate_interaction_counts()
+    return f"Исправлено счетчиков отметок: {updated_count}"
+
+
+@shared_task
+def refresh_trending_scores():
+    """Применение накопленной активности к рейтингу популярности (только затронутые мероприятия)"""
+    updated_count = trending.refresh()
+    return f"Обновлено рейтингов популярности: {updated_count}"
+
+
+@shared_task
+def rebuild_recommendations():
+    """Пересчет списков рекомендаций (совместные отметки, интересы, город)"""
+    user_count = recommendations.rebuild()
+    return f"Пользователей со списком рекомендаций: {user_count}"
+
+
+@shared_task
+def rebuild_event_similarity():
+    """Полная пересборка индекса похожих мероприятий"""
+    event_count = similarity.rebuild()
+    return f"Мероприятий в индексе похожих: {event_count}"
+
+
+@shared_task
+def refresh_event_similarity():
+    """Обновление похожих для мероприятий, измененных с прошлого запуска"""
+    updated_count = similarity.refresh()
+    return f"Обновлено списков похожих: {updated_count}"
+
+
+@shared_task
+def complete_past_events():
+    """Перевод прошедших мероприятий в статус completed пачками"""
+    completed_count = Event.complete_past()
+    return f"Завершено мероприятий: {completed_count}"
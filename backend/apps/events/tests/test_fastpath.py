@@ -0,0 +1,102 @@
+"""
+Совпадение быстрой сериализации списка (FastEventListSerializer) с
+EventListSerializer
+
+Строка values() собирается из несохраненного мероприятия, поэтому тесты
+не обращаются к БД; проверка на реальных данных — команда check_list_parity.
+"""
+import datetime
+from decimal import Decimal
+from django.test import SimpleTestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apps.events.fastpath import FastEventListSerializer
+from apps.events.models import Category, Event
+from apps.events.serializers import EventListSerializer
+
+
+def make_request(query=''):
+    return Request(APIRequestFactory().get(f'/api/v1/events/?{query}', HTTP_HOST='testserver'))
+
+
+def make_event(**overrides):
+    category = Category(pk=2, name='Концерты', slug='concerts')
+    values = dict(
+        pk=1,
+        title='Джазовый вечер',
+        slug='dzhazovyi-vecher',
+        short_description='Живая музыка',
+        image='events/jazz.jpg',
+        start_date=datetime.date(2030, 5, 17),
+        start_time=datetime.time(19, 30),
+        city='Москва',
+        address='ул. Тверская, 1',
+        venue_name='Клуб',
+        category=category,
+        is_free=False,
+        price_min=Decimal('500.00'),
+        price_max=Decimal('1500.50'),
+        age_restriction='16+',
+        reviews_count=3,
+        rating_sum=13,
+        views_count=42,
+        interested_count=5,
+        going_count=2,
+        is_featured=True,
+    )
+    values.update(overrides)
+    return Event(**values)
+
+
+def values_row(event, columns):
+    """Строка queryset.values(*columns) для мероприятия"""
+    row = {}
+    for column in columns:
+        *relations, name = column.split('__')
+        obj = event
+        for relation in relations:
+            obj = getattr(obj, relation)
+        if obj is None:
+            row[column] = None  # Пустая связь: LEFT JOIN дает NULL
+            continue
+        field = obj._meta.get_field(name)
+        row[column] = field.get_prep_value(getattr(obj, field.attname))
+    return row
+
+
+@override_settings(EVENT_VIEWS_BUFFERED=False)
+class FastEventListSerializerParityTest(SimpleTestCase):
+    """Поля и значения быстрой сериализации совпадают с EventListSerializer"""
+
+    def serialize_both(self, event, query=''):
+        request = make_request(query)
+        fast = FastEventListSerializer(Event.objects.all(), request)
+        row = values_row(event, fast.queryset.query.values_select)
+        expected = EventListSerializer(event, context={'request': request}).data
+        return expected, fast.serialize([row])[0]
+
+    def test_same_fields(self):
+        fast = FastEventListSerializer(Event.objects.all(), make_request('search=джаз'))
+        self.assertEqual(set(fast.field_names), set(EventListSerializer.Meta.fields))
+
+    def test_same_fields_without_search(self):
+        request = make_request()
+        fast = FastEventListSerializer(Event.objects.all(), request)
+        serializer = EventListSerializer(context={'request': request})
+        self.assertEqual(fast.field_names, list(serializer.fields))
+
+    def test_same_output(self):
+        for query in ('', 'search=джаз', 'fields=id,title,image,average_rating', 'omit=price_min'):
+            with self.subTest(query=query):
+                expected, actual = self.serialize_both(make_event(), query)
+                self.assertEqual(actual, dict(expected))
+                self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_same_output_with_empty_values(self):
+        event = make_event(
+            image=None, start_time=None, price_min=None, price_max=None,
+            reviews_count=0, rating_sum=0, category=None,
+        )
+        expected, actual = self.serialize_both(event)
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
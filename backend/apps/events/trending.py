@@ -0,0 +1,155 @@
+"""
+Рейтинг популярности мероприятий с экспоненциальным затуханием
+
+Очки хранятся в логарифмической шкале относительно фиксированной эпохи:
+
+    trending_score = ln(Σ wᵢ · e^(λ·(tᵢ − EPOCH)))
+
+где wᵢ — вес события (просмотр, отметка, одобренный отзыв), λ = ln 2 /
+период полураспада. Затухание к текущему моменту — общий для всех
+мероприятий множитель e^(−λ·(now − EPOCH)), он не меняет порядок, поэтому
+очки без новой активности не пересчитываются. Новая активность веса w
+добавляется как logaddexp(score, ln w + λ·(now − EPOCH)).
+
+Активность копится в хэше Redis, задача refresh_trending_scores
+раз в несколько минут применяет ее одним UPDATE только к мероприятиям
+с новой активностью (каждый буфер — ровно один раз). 0 означает «активности не было».
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+import redis
+from django.db import connection, transaction
+from django.utils import timezone
+from .counters import claim_buffer, get_redis, mark_flushed
+from .models import Event, UserEventInteraction
+
+PENDING_TRENDING_KEY = 'events:trending:pending'
+FLUSHING_TRENDING_KEY = 'events:trending:flushing'
+FLUSH_ID_KEY = 'events:trending:flush_id'
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+HALF_LIFE_HOURS = 24
+DECAY_RATE = math.log(2) / HALF_LIFE_HOURS
+
+WEIGHTS = {
+    'view': 1.0,
+    'interested': 3.0,
+    'going': 5.0,
+    'review': 4.0,
+}
+
+
+def decay_offset(moment=None):
+    """λ·(moment − EPOCH): слагаемое логарифма для активности в момент moment"""
+    moment = moment or timezone.now()
+    return DECAY_RATE * (moment - EPOCH).total_seconds() / 3600
+
+
+def record(event_id, kind, count=1):
+    """Учитывает активность kind ('view', 'interested', 'going', 'review')"""
+    record_many({event_id: WEIGHTS[kind] * count})
+
+
+def record_many(weights, pipe=None):
+    """
+    Добавляет веса активности {event_id: вес} в буфер
+
+    Если передан pipeline Redis, команды добавляются в него (выполняет
+    вызывающий код). Недоступность Redis не мешает основному действию.
+    """
+    weights = {event_id: weight for event_id, weight in weights.items() if weight > 0}
+    if not weights:
+        return
+    try:
+        target = pipe if pipe is not None else get_redis().pipeline(transaction=False)
+        for event_id, weight in weights.items():
+            target.hincrbyfloat(PENDING_TRENDING_KEY, event_id, weight)
+        if pipe is None:
+            target.execute()
+    except redis.RedisError:
+        pass  # Активность теряется, рейтинг выровняется следующей активностью
+
+
+def refresh():
+    """
+    Применяет накопленную активность к trending_score одним UPDATE
+
+    Как и перенос просмотров (counters.flush_views): буфер забирается вместе
+    с идентификатором переноса, который записывается в CounterFlush в одной
+    транзакции с UPDATE. Параллельные запуски выполняются по очереди, а
+    буфер, оставшийся после сбоя, повторно не применяется — затухание не
+    исправило бы дважды учтенную активность.
+
+    Returns:
+        количество обновленных мероприятий
+    """
+    client = get_redis()
+
+    flush_id = claim_buffer(client, PENDING_TRENDING_KEY, FLUSHING_TRENDING_KEY, FLUSH_ID_KEY)
+    if flush_id is None:
+        return 0  # Новой активности нет
+
+    offset = decay_offset()
+    increments = [
+        (int(event_id), math.log(float(weight)) + offset)
+        for event_id, weight in client.hgetall(FLUSHING_TRENDING_KEY).items()
+        if float(weight) > 0
+    ]
+
+    with transaction.atomic():
+        if not mark_flushed(FLUSHING_TRENDING_KEY, flush_id):
+            increments = []  # Уже применен, осталось удалить буфер
+        elif increments:
+            table = connection.ops.quote_name(Event._meta.db_table)
+            values = ', '.join(['(%s, %s::double precision)'] * len(increments))
+            # logaddexp(a, b) = max(a, b) + ln(1 + e^(−|a − b|)) — без переполнения
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} SET trending_score = CASE '
+                    f'WHEN {table}.trending_score = 0 THEN v.score '
+                    f'ELSE GREATEST({table}.trending_score, v.score) '
+                    f'+ LN(1 + EXP(-ABS({table}.trending_score - v.score))) END '
+                    f'FROM (VALUES {values}) AS v(id, score) WHERE {table}.id = v.id',
+                    [value for pair in increments for value in pair]
+                )
+        transaction.on_commit(lambda: client.delete(FLUSHING_TRENDING_KEY, FLUSH_ID_KEY))
+
+    return len(increments)
+
+
+def rebuild(days=14):
+    """
+    Пересчет очков с нуля по отметкам и одобренным отзывам за последние
+    days дней (просмотры не хранят времени и не учитываются). Для первого
+    заполнения и исправлений; текущий буфер активности не затрагивается.
+
+    Returns:
+        количество мероприятий с ненулевыми очками
+    """
+    from apps.reviews.models import Review
+
+    since = timezone.now() - timedelta(days=days)
+    interactions = UserEventInteraction.objects.filter(created_at__gte=since).values_list(
+        'event_id', 'created_at', 'interaction_type'
+    )
+    reviews = Review.objects.filter(status='approved', created_at__gte=since).values_list(
+        'event_id', 'created_at'
+    )
+
+    terms = defaultdict(list)
+    for event_id, created_at, interaction_type in interactions.iterator(chunk_size=5000):
+        terms[event_id].append(math.log(WEIGHTS[interaction_type]) + decay_offset(created_at))
+    for event_id, created_at in reviews.iterator(chunk_size=5000):
+        terms[event_id].append(math.log(WEIGHTS['review']) + decay_offset(created_at))
+
+    scores = {}
+    for event_id, values in terms.items():
+        peak = max(values)
+        scores[event_id] = peak + math.log(sum(math.exp(value - peak) for value in values))
+
+    with transaction.atomic():
+        Event.objects.exclude(trending_score=0).update(trending_score=0)
+        events = [Event(pk=event_id, trending_score=score) for event_id, score in scores.items()]
+        Event.objects.bulk_update(events, ['trending_score'], batch_size=1000)
+    return len(scores)
@@ -1,15 +1,31 @@
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, SAFE_METHODS
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404, StreamingHttpResponse
 from django.utils import timezone
+from functools import reduce
+from operator import or_
 from .models import Event, Category, UserEventInteraction
 from .serializers import (
     EventListSerializer, EventDetailSerializer, EventCreateUpdateSerializer,
-    CategorySerializer, UserEventInteractionSerializer
+    CategorySerializer, UserEventInteractionSerializer, BulkInteractionSerializer
 )
-from .filters import EventFilter
+from utils.fieldsets import requested_fields, sparse_queryset
+from utils.renderers import CSVRenderer, NDJSONRenderer
+from .filters import EventFilter, EventOrderingFilter
+from .counters import record_view, merge_pending_views
+from .fastpath import FastEventListSerializer
+from .export import EventExport
+from .facets import EventFacets
+from . import cache, calendar_counts, conditional, recommendations, similarity
+from .clusters import get_clusters
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet для категорий мероприятий"""
@@ -17,23 +33,55 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = 'slug'
+    
+    def list(self, request, *args, **kwargs):
+        """Список категорий с поддержкой условных запросов (ETag)"""
+        etag = conditional.category_etag(request)
+        response = conditional.not_modified(request, etag) or super().list(request, *args, **kwargs)
+        return conditional.set_validators(response, request, etag, max_age=settings.CATEGORY_MAX_AGE)
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Категория с поддержкой условных запросов (ETag)"""
+        etag = conditional.category_etag(request, kwargs.get(self.lookup_field))
+        response = conditional.not_modified(request, etag) or super().retrieve(request, *args, **kwargs)
+        return conditional.set_validators(response, request, etag, max_age=settings.CATEGORY_MAX_AGE)
 
 
 class EventViewSet(viewsets.ModelViewSet):
     """ViewSet для мероприятий"""
     
-    queryset = Event.objects.select_related('category').filter(status='published')
+    queryset = Event.objects.select_related('category').filter(status__in=Event.VISIBLE_STATUSES)
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, EventOrderingFilter]
     filterset_class = EventFilter
-    search_fields = ['title', 'description', 'organizer', 'city']
-    ordering_fields = ['start_date', 'created_at', 'views_count']
+    ordering_fields = [
+        'start_date', 'created_at', 'views_count', 'going_count', 'interested_count',
+        'trending_score',
+    ]
     ordering = ['start_date']
+    keyset_ordering = ['start_date', 'start_time', 'id']
     lookup_field = 'slug'
     
+    # Действия, список которых сериализуется без создания моделей (fastpath)
+    fast_list_actions = ('list', 'featured', 'trending', 'recommended', 'similar', 'my_events')
+    
+    # Максимум точек в ответе /events/map/
+    MAP_POINTS_LIMIT = 2000
+    
+    # Максимум мероприятий в ответе /events/batch/
+    BATCH_LIMIT = 50
+    
+    # Мероприятий в ответе /events/trending/
+    TRENDING_LIMIT = 20
+    
+    # Мероприятий в ответе /events/recommended/
+    RECOMMENDED_LIMIT = 20
+    
     def get_serializer_class(self):
         """Возвращает соответствующий сериализатор"""
-        if self.action == 'list':
+        if self.action in [
+            'list', 'featured', 'trending', 'recommended', 'similar', 'my_events', 'export'
+        ]:
             return EventListSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return EventCreateUpdateSerializer
@@ -43,19 +91,100 @@ class EventViewSet(viewsets.ModelViewSet):
         """Фильтрация событий (только будущие по умолчанию)"""
         queryset = super().get_queryset()
         
-        # Фильтр по дате (только будущие события)
+        # Фильтр по дате (только будущие события); прошедшие — завершенные
+        # (completed) и еще не переведенные в completed — только с show_past
         show_past = self.request.query_params.get('show_past', 'false')
         if show_past.lower() != 'true':
-            queryset = queryset.filter(start_date__gte=timezone.now().date())
+            queryset = queryset.filter(status='published', start_date__gte=timezone.now().date())
+        
+        # Только колонки, нужные полям из ?fields= / ?omit=
+        if self.request.method in SAFE_METHODS:
+            queryset = sparse_queryset(
+                queryset, self.get_serializer_class(), self.request, self.keyset_ordering
+            )
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """Список мероприятий (для анонимных пользователей — из общего кэша)"""
+        if request.user.is_authenticated:
+            return self._list(request)
+        return Response(cache.get_or_compute(request, 'list', lambda: self._list(request).data))
+    
+    def _list(self, request):
+        """Список мероприятий с учетом еще не перенесенных в БД просмотров"""
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+    
+    def list_response(self, queryset):
+        """Постраничный ответ со списком мероприятий"""
+        fast = self.get_fast_serializer(queryset)
+        if fast is not None:
+            queryset = fast.queryset
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_list(page, fast))
+        
+        return Response(self.serialize_list(queryset, fast))
+    
+    def get_fast_serializer(self, queryset):
+        """Быстрый сериализатор, если он включен для текущего действия, иначе None"""
+        if self.action not in self.fast_list_actions:
+            return None
+        return FastEventListSerializer(queryset, self.request, self.keyset_ordering)
+    
+    def serialize_list(self, events, fast=None):
+        """Данные списка мероприятий в формате EventListSerializer"""
+        if fast is not None:
+            return fast.serialize(events)
+        events = merge_pending_views(events)
+        serializer = EventListSerializer(
+            events, many=True, context=self.get_list_context(events)
+        )
+        return serializer.data
+    
+    def get_list_context(self, events):
+        """
+        Контекст сериализатора списка: отметки пользователя для всех
+        мероприятий одним запросом (для анонимных — без запросов)
+        """
+        context = self.get_serializer_context()
+        names = requested_fields(self.request, ['user_interaction'])
+        if self.request.user.is_authenticated and (names is None or names):
+            context['user_interactions'] = UserEventInteraction.get_user_map(
+                self.request.user, [event.pk for event in events]
+            )
+        return context
+    
     def retrieve(self, request, *args, **kwargs):
-        """Увеличиваем счетчик просмотров при просмотре детальной информации"""
-        instance = self.get_object()
-        instance.increment_views()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        """
+        Увеличиваем счетчик просмотров при просмотре детальной информации
+        
+        Если ETag/Last-Modified клиента актуальны, возвращается 304 без
+        загрузки и сериализации мероприятия (просмотр все равно учитывается).
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        validators = conditional.event_validators(queryset, request)
+        if validators is None:
+            raise Http404
+        pk, etag, last_modified = validators
+        
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is not None:
+            record_view(Event(pk=pk))
+        else:
+            instance = self.get_object()
+            record_view(instance)
+            merge_pending_views([instance])
+            serializer = self.get_serializer(instance)
+            response = Response(serializer.data)
+        
+        return conditional.set_validators(
+            response, request, etag, last_modified, max_age=settings.EVENT_DETAIL_MAX_AGE
+        )
     
     def perform_create(self, serializer):
         """Сохраняем создателя мероприятия"""
@@ -72,9 +201,12 @@ class EventViewSet(viewsets.ModelViewSet):
         )
         
         if not created:
-            interaction.delete()
+            deleted, _ = interaction.delete()
+            if deleted:
+                Event.apply_interaction_delta(event.pk, 'interested', -1)
             return Response({'status': 'removed'}, status=status.HTTP_200_OK)
         
+        Event.apply_interaction_delta(event.pk, 'interested', 1)
         return Response({'status': 'added'}, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
@@ -88,9 +220,12 @@ class EventViewSet(viewsets.ModelViewSet):
         )
         
         if not created:
-            interaction.delete()
+            deleted, _ = interaction.delete()
+            if deleted:
+                Event.apply_interaction_delta(event.pk, 'going', -1)
             return Response({'status': 'removed'}, status=status.HTTP_200_OK)
         
+        Event.apply_interaction_delta(event.pk, 'going', 1)
         return Response({'status': 'added'}, status=status.HTTP_201_CREATED)
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
@@ -103,22 +238,226 @@ class EventViewSet(viewsets.ModelViewSet):
             interactions = interactions.filter(interaction_type=interaction_type)
         
         event_ids = interactions.values_list('event_id', flat=True)
-        events = Event.objects.filter(id__in=event_ids, status='published')
+        events = sparse_queryset(
+            Event.objects.select_related('category').filter(
+                id__in=event_ids, status__in=Event.VISIBLE_STATUSES
+            ),
+            EventListSerializer, request, self.keyset_ordering
+        )
         
-        page = self.paginate_queryset(events)
-        if page is not None:
-            serializer = EventListSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
+        return self.list_response(events)
+    
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Выгрузка всех мероприятий по параметрам EventFilter одним потоковым
+        ответом: NDJSON (по умолчанию) или CSV (?format=csv / Accept: text/csv).
+        Без пагинации и COUNT(*), строки в формате списка /events/.
+        """
+        export = EventExport(self.filter_queryset(self.get_queryset()), request)
+        renderer = request.accepted_renderer
         
-        serializer = EventListSerializer(events, many=True, context={'request': request})
+        response = StreamingHttpResponse(
+            renderer.stream(export.rows(), export.fields),
+            content_type=renderer.media_type if not renderer.charset
+            else f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = f'attachment; filename="events.{renderer.format}"'
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Счетчики для панели фильтров: категории, возрастные ограничения,
+        бесплатные/платные, города и интервалы дат. Принимает параметры
+        EventFilter; фасет считается без собственного фильтра. Ответ
+        кэшируется по нормализованной строке запроса (одинаков для всех
+        пользователей).
+        """
+        return Response(cache.get_or_compute(
+            request, 'facets', lambda: EventFacets(self.get_queryset(), request).counts()
+        ))
+    
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Число мероприятий по дням месяца: ?month=YYYY-MM и параметры EventFilter
+        
+        Многодневные мероприятия учитываются в каждом дне; прошедшие дни
+        месяца тоже считаются (show_past не нужен). Ответ кэшируется и
+        сбрасывается при изменении мероприятий этого месяца.
+        """
+        first, last = calendar_counts.parse_month(request.query_params.get('month'))
+        return Response(cache.get_or_compute(
+            request, 'calendar', lambda: self._calendar(request, first, last),
+            version_key=calendar_counts.version_key(first)
+        ))
+    
+    def _calendar(self, request, first, last):
+        queryset = self.queryset.all()
+        if first > timezone.now().date():
+            # Завершенные мероприятия в будущие месяцы не попадают, а условие
+            # status='published' позволяет использовать частичные индексы
+            queryset = queryset.filter(status='published')
+        queryset = DjangoFilterBackend().filter_queryset(request, queryset, self)
+        return calendar_counts.day_counts(queryset, first, last)
+    
+    @action(detail=False, methods=['get'])
+    def batch(self, request):
+        """
+        Несколько мероприятий одним запросом: ?slugs=a,b,c и/или ?ids=1,2,3
+        (всего не больше BATCH_LIMIT). Формат — как у детальной страницы,
+        просмотры не учитываются. Ненайденные мероприятия пропускаются,
+        порядок — как в запросе.
+        """
+        slugs = self._parse_list(request.query_params.get('slugs'))
+        try:
+            ids = [int(value) for value in self._parse_list(request.query_params.get('ids'))]
+        except ValueError:
+            raise ValidationError({'ids': 'Ожидаются целые числа через запятую'})
+        
+        if not slugs and not ids:
+            raise ValidationError('Укажите slugs или ids')
+        if len(slugs) + len(ids) > self.BATCH_LIMIT:
+            raise ValidationError(f'Не больше {self.BATCH_LIMIT} мероприятий за запрос')
+        
+        positions = {('slug', slug): index for index, slug in enumerate(slugs)}
+        positions.update({('id', pk): len(slugs) + index for index, pk in enumerate(ids)})
+        events = merge_pending_views(self.get_queryset().filter(Q(slug__in=slugs) | Q(id__in=ids)))
+        events.sort(key=lambda event: min(
+            positions.get(('slug', event.slug), len(positions)),
+            positions.get(('id', event.pk), len(positions)),
+        ))
+        
+        serializer = self.get_serializer(events, many=True, context=self.get_list_context(events))
         return Response(serializer.data)
     
+    @staticmethod
+    def _parse_list(value):
+        """Значения параметра через запятую без пустых и повторов"""
+        if not value:
+            return []
+        return list(dict.fromkeys(part.strip() for part in value.split(',') if part.strip()))
+    
+    @action(detail=False, methods=['get'], url_path='map')
+    def map_points(self, request):
+        """
+        Точки для карты в компактном виде: [id, title, latitude, longitude]
+        (и distance, км, при фильтре near). Поддерживает все параметры EventFilter,
+        в том числе bbox и near/radius_km.
+        """
+        if request.user.is_authenticated:
+            return Response(self._map_points(request))
+        return Response(cache.get_or_compute(request, 'map', lambda: self._map_points(request)))
+    
+    def _map_points(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            latitude__isnull=False, longitude__isnull=False
+        )
+        fields = ['id', 'title', 'latitude', 'longitude']
+        if request.query_params.get('near'):
+            fields.append('distance')
+        
+        results = []
+        for row in queryset.values_list(*fields)[:self.MAP_POINTS_LIMIT]:
+            point = [row[0], row[1], float(row[2]), float(row[3])]
+            if len(row) > 4:
+                point.append(round(row[4], 3))
+            results.append(point)
+        return {'fields': fields, 'results': results}
+    
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """
+        Кластеры мероприятий для карты: ?bbox=min_lon,min_lat,max_lon,max_lat&zoom=0..18
+        
+        Данные берутся из предрасчитанной пирамиды (только предстоящие
+        опубликованные мероприятия), фильтры EventFilter не применяются.
+        """
+        try:
+            zoom = int(request.query_params.get('zoom', ''))
+        except ValueError:
+            raise ValidationError('Ожидаются параметры bbox=min_lon,min_lat,max_lon,max_lat и zoom')
+        min_lon, min_lat, max_lon, max_lat = EventFilter._parse_floats(
+            'bbox', request.query_params.get('bbox', ''), ('lon', 'lat', 'lon', 'lat')
+        )
+        if min_lat > max_lat or min_lon > max_lon:
+            raise ValidationError({'bbox': 'Ожидается min_lon,min_lat,max_lon,max_lat'})
+        
+        results = get_clusters(zoom, min_lat, min_lon, max_lat, max_lon)
+        return Response({
+            'zoom': zoom,
+            'fields': ['cell', 'count', 'latitude', 'longitude', 'category', 'category_name'],
+            'results': results,
+        })
+    
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Получить рекомендуемые мероприятия"""
-        events = self.get_queryset().filter(is_featured=True)[:10]
-        serializer = EventListSerializer(events, many=True, context={'request': request})
-        return Response(serializer.data)
+        if request.user.is_authenticated:
+            return Response(self._featured(request))
+        return Response(cache.get_or_compute(request, 'featured', lambda: self._featured(request)))
+    
+    def _featured(self, request):
+        queryset = self.get_queryset().filter(is_featured=True)
+        fast = self.get_fast_serializer(queryset)
+        if fast is not None:
+            queryset = fast.queryset
+        return self.serialize_list(queryset[:10], fast)
+    
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """
+        Популярные сейчас мероприятия (просмотры, отметки и отзывы с
+        затуханием): ?city= и остальные параметры EventFilter
+        """
+        if request.user.is_authenticated:
+            return Response(self._trending(request))
+        return Response(cache.get_or_compute(request, 'trending', lambda: self._trending(request)))
+    
+    def _trending(self, request):
+        queryset = DjangoFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        queryset = queryset.filter(trending_score__gt=0).order_by('-trending_score', 'id')
+        fast = self.get_fast_serializer(queryset)
+        if fast is not None:
+            queryset = fast.queryset
+        return self.serialize_list(queryset[:self.TRENDING_LIMIT], fast)
+
+    
+    @action(detail=True, methods=['get'])
+    def similar(self, request, slug=None):
+        """
+        Похожие по тексту мероприятия (предрасчитанные соседи) одним
+        запросом по индексу; для неизвестного slug — пустой список
+        """
+        queryset = self.get_queryset().filter(similar_to_links__event__slug=slug).order_by(
+            '-similar_to_links__score', 'id'
+        )
+        fast = self.get_fast_serializer(queryset)
+        if fast is not None:
+            queryset = fast.queryset
+        return Response(self.serialize_list(queryset[:similarity.SIMILAR_LIMIT], fast))
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def recommended(self, request):
+        """
+        Рекомендации для текущего пользователя: по интересам, городу и
+        совместным отметкам других пользователей. Список id берется из
+        кэша (ночной пересчет), мероприятия — одним запросом; уже
+        отмеченные пользователем не показываются.
+        """
+        event_ids = recommendations.for_user(request.user)
+        positions = {event_id: index for index, event_id in enumerate(event_ids)}
+        
+        queryset = self.get_queryset().filter(pk__in=event_ids).exclude(
+            user_interactions__user=request.user
+        )
+        fast = self.get_fast_serializer(queryset)
+        if fast is not None:
+            events = sorted(fast.queryset, key=lambda row: positions[row['id']])
+        else:
+            events = sorted(queryset, key=lambda event: positions[event.pk])
+        return Response(self.serialize_list(events[:self.RECOMMENDED_LIMIT], fast))
 
 
 class UserEventInteractionViewSet(viewsets.ModelViewSet):
@@ -127,12 +466,110 @@ class UserEventInteractionViewSet(viewsets.ModelViewSet):
     serializer_class = UserEventInteractionSerializer
     permission_classes = [IsAuthenticated]
     
+    # Максимум элементов в запросе /interactions/bulk/
+    BULK_LIMIT = 500
+    
     def get_queryset(self):
         """Возвращает только взаимодействия текущего пользователя"""
         return UserEventInteraction.objects.filter(
             user=self.request.user
         ).select_related('event', 'event__category')
     
+    def get_serializer(self, *args, **kwargs):
+        """Отметки пользователя для вложенных мероприятий — одним запросом на страницу"""
+        if kwargs.get('many') and args:
+            interactions = list(args[0])
+            context = kwargs.setdefault('context', self.get_serializer_context())
+            context['user_interactions'] = UserEventInteraction.get_user_map(
+                self.request.user, {interaction.event_id for interaction in interactions}
+            )
+            args = (interactions,) + args[1:]
+        return super().get_serializer(*args, **kwargs)
+    
     def perform_create(self, serializer):
-        """Сохраняем текущего пользователя"""
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        """Сохраняем текущего пользователя и обновляем счетчик мероприятия"""
+        interaction = serializer.save(user=self.request.user)
+        Event.apply_interaction_delta(interaction.event_id, interaction.interaction_type, 1)
+    
+    def perform_update(self, serializer):
+        """Перенос отметки на другое мероприятие или тип меняет оба счетчика"""
+        previous = (serializer.instance.event_id, serializer.instance.interaction_type)
+        interaction = serializer.save()
+        current = (interaction.event_id, interaction.interaction_type)
+        if previous != current:
+            Event.apply_interaction_delta(*previous, -1)
+            Event.apply_interaction_delta(*current, 1)
+    
+    def perform_destroy(self, instance):
+        """Удаляем отметку и уменьшаем счетчик мероприятия"""
+        deleted, _ = instance.delete()
+        if deleted:
+            Event.apply_interaction_delta(instance.event_id, instance.interaction_type, -1)
+    
+    @action(detail=False, methods=['put'])
+    def bulk(self, request):
+        """
+        Установка отметок списком:
+        [{"event": 1, "interaction_type": "going", "state": true}, ...]
+        
+        Отметки со state=true создаются, со state=false — удаляются, все
+        в одной транзакции; повтор запроса ничего не меняет. Возвращает
+        итоговые отметки пользователя и счетчики затронутых мероприятий.
+        """
+        serializer = BulkInteractionSerializer(
+            data=request.data, many=True, max_length=self.BULK_LIMIT
+        )
+        serializer.is_valid(raise_exception=True)
+        
+        # При повторах пары (мероприятие, тип) действует последнее значение
+        wanted = {
+            (item['event'], item['interaction_type']): item['state']
+            for item in serializer.validated_data
+        }
+        event_ids = {event_id for event_id, _ in wanted}
+        missing = event_ids - set(Event.objects.filter(pk__in=event_ids).values_list('pk', flat=True))
+        if missing:
+            raise ValidationError({'event': f'Мероприятия не найдены: {sorted(missing)}'})
+        
+        user = request.user
+        with transaction.atomic():
+            # Блокировка пользователя упорядочивает его параллельные bulk-запросы,
+            # поэтому набор существующих отметок и изменения счетчиков точны
+            get_user_model().objects.select_for_update().only('pk').get(pk=user.pk)
+            existing = set(UserEventInteraction.objects.filter(
+                user=user, event_id__in=event_ids
+            ).values_list('event_id', 'interaction_type'))
+            
+            to_create = [pair for pair, state in wanted.items() if state and pair not in existing]
+            to_delete = [pair for pair, state in wanted.items() if not state and pair in existing]
+            
+            UserEventInteraction.objects.bulk_create([
+                UserEventInteraction(user=user, event_id=event_id, interaction_type=interaction_type)
+                for event_id, interaction_type in to_create
+            ], ignore_conflicts=True)
+            if to_delete:
+                UserEventInteraction.objects.filter(
+                    reduce(or_, (
+                        Q(event_id=event_id, interaction_type=interaction_type)
+                        for event_id, interaction_type in to_delete
+                    )),
+                    user=user
+                ).delete()
+            
+            deltas = dict.fromkeys(to_create, 1)
+            deltas.update(dict.fromkeys(to_delete, -1))
+            Event.apply_interaction_deltas(deltas)
+        
+        interactions = UserEventInteraction.get_user_map(user, event_ids)
+        counters = Event.objects.filter(pk__in=event_ids).order_by('pk').values(
+            'pk', 'interested_count', 'going_count'
+        )
+        return Response([
+            {
+                'event': row['pk'],
+                'user_interaction': interactions.get(row['pk'], []),
+                'interested_count': row['interested_count'],
+                'going_count': row['going_count'],
+            }
+            for row in counters
+        ])
@@ -0,0 +1,139 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("events", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PushSubscription",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("endpoint", models.URLField(unique=True, verbose_name="Endpoint")),
+                (
+                    "p256dh",
+                    models.CharField(max_length=255, verbose_name="P256dh ключ"),
+                ),
+                ("auth", models.CharField(max_length=255, verbose_name="Auth ключ")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата создания"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="push_subscriptions",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Push подписка",
+                "verbose_name_plural": "Push подписки",
+            },
+        ),
+        migrations.CreateModel(
+            name="Notification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "notification_type",
+                    models.CharField(
+                        choices=[
+                            ("new_event", "Новое мероприятие"),
+                            ("event_reminder", "Напоминание о мероприятии"),
+                            ("event_update", "Обновление мероприятия"),
+                            ("event_cancelled", "Отмена мероприятия"),
+                        ],
+                        max_length=20,
+                        verbose_name="Тип уведомления",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200, verbose_name="Заголовок")),
+                ("message", models.TextField(verbose_name="Сообщение")),
+                (
+                    "is_read",
+                    models.BooleanField(default=False, verbose_name="Прочитано"),
+                ),
+                (
+                    "is_sent",
+                    models.BooleanField(default=False, verbose_name="Отправлено"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата создания"
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Дата отправки"
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="events.event",
+                        verbose_name="Мероприятие",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Уведомление",
+                "verbose_name_plural": "Уведомления",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "is_read"],
+                        name="notificatio_user_id_427e4b_idx",
+                    ),
+                    models.Index(
+                        fields=["is_sent", "created_at"],
+                        name="notificatio_is_sent_2262e4_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
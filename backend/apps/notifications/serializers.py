@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from utils.fieldsets import SparseFieldsetsMixin
 from .models import Notification, PushSubscription
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = [
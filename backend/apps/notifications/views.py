@@ -1,17 +1,24 @@
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from utils.fieldsets import sparse_queryset
 from .models import Notification
 from .serializers import NotificationSerializer
 
 class NotificationViewSet(viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ['-created_at', 'id']
     
     def get_queryset(self):
-        return Notification.objects.filter(
+        queryset = Notification.objects.filter(
             user=self.request.user
         ).select_related('event').order_by('-created_at')
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = sparse_queryset(
+                queryset, self.get_serializer_class(), self.request, ['created_at']
+            )
+        return queryset
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db import transaction
+from apps.events.models import Event
 from .models import Review
 
 @admin.register(Review)
@@ -10,10 +12,17 @@ class ReviewAdmin(admin.ModelAdmin):
     
     actions = ['approve_reviews', 'reject_reviews']
     
+    def _set_status(self, queryset, status):
+        """Массовая смена статуса с пересчетом агрегатов затронутых мероприятий"""
+        with transaction.atomic():
+            event_ids = set(queryset.values_list('event_id', flat=True))
+            queryset.update(status=status)
+            Event.recalculate_ratings(event_ids)
+    
     def approve_reviews(self, request, queryset):
-        queryset.update(status='approved')
+        self._set_status(queryset, 'approved')
     approve_reviews.short_description = "Одобрить выбранные отзывы"
     
     def reject_reviews(self, request, queryset):
-        queryset.update(status='rejected')
+        self._set_status(queryset, 'rejected')
     reject_reviews.short_description = "Отклонить выбранные отзывы"
\ No newline at end of file
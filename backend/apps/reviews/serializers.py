@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from utils.fieldsets import SparseFieldsetsMixin
 from .models import Review
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     user_username = serializers.CharField(source='user.username', read_only=True)
     user_avatar = serializers.ImageField(source='user.avatar', read_only=True)
     
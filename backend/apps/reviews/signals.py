@@ -0,0 +1,45 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from apps.events.models import Event
+from .models import Review
+
+
+def _approved_state(event_id, rating, status):
+    """Вклад отзыва в агрегаты мероприятия (None, если отзыв не одобрен)"""
+    if status == 'approved':
+        return event_id, rating
+    return None
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_state(sender, instance, **kwargs):
+    """Запоминаем состояние отзыва до сохранения, чтобы вычислить разницу"""
+    instance._previous_approved_state = None
+    if instance.pk:
+        previous = Review.objects.filter(pk=instance.pk).values(
+            'event_id', 'rating', 'status'
+        ).first()
+        if previous:
+            instance._previous_approved_state = _approved_state(**previous)
+
+
+@receiver(post_save, sender=Review)
+def update_event_rating_on_save(sender, instance, created, **kwargs):
+    """Инкрементально обновляет агрегаты при создании, изменении и модерации отзыва"""
+    previous = getattr(instance, '_previous_approved_state', None)
+    current = _approved_state(instance.event_id, instance.rating, instance.status)
+
+    if previous == current:
+        return
+
+    if previous:
+        Event.apply_review_delta(*previous, delta=-1)
+    if current:
+        Event.apply_review_delta(*current, delta=1)
+
+
+@receiver(post_delete, sender=Review)
+def update_event_rating_on_delete(sender, instance, **kwargs):
+    """Вычитает удаленный одобренный отзыв из агрегатов мероприятия"""
+    if instance.status == 'approved':
+        Event.apply_review_delta(instance.event_id, instance.rating, delta=-1)
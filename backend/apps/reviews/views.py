@@ -1,10 +1,12 @@
 from rest_framework import viewsets, permissions
+from utils.fieldsets import sparse_queryset
 from .models import Review
 from .serializers import ReviewSerializer
 
 class ReviewViewSet(viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    keyset_ordering = ['-created_at', 'id']
     
     def get_queryset(self):
         queryset = Review.objects.select_related('user', 'event')
@@ -16,7 +18,12 @@ class ReviewViewSet(viewsets.ModelViewSet):
         if event_id:
             queryset = queryset.filter(event_id=event_id)
         
-        return queryset.order_by('-created_at')
+        queryset = queryset.order_by('-created_at')
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = sparse_queryset(
+                queryset, self.get_serializer_class(), self.request, ['created_at']
+            )
+        return queryset
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user, status='pending')
\ No newline at end of file
@@ -30,6 +30,46 @@ app.conf.beat_schedule = {
         'task': 'apps.events.tasks.import_events_from_kudago',
         'schedule': crontab(hour=2, minute=0),
     },
+    # Перевод прошедших мероприятий в completed (ежедневно в 0:01)
+    'complete-past-events': {
+        'task': 'apps.events.tasks.complete_past_events',
+        'schedule': crontab(hour=0, minute=1),
+    },
+    # Пересборка кластеров карты после смены дня (ежедневно в 0:05)
+    'rebuild-map-clusters': {
+        'task': 'apps.events.tasks.rebuild_map_clusters',
+        'schedule': crontab(hour=0, minute=5),
+    },
+    # Перенос буферизованных просмотров в БД (ежеминутно)
+    'flush-event-views': {
+        'task': 'apps.events.tasks.flush_event_views',
+        'schedule': crontab(minute='*'),
+    },
+    # Обновление рейтинга популярности по новой активности (каждые 5 минут)
+    'refresh-trending-scores': {
+        'task': 'apps.events.tasks.refresh_trending_scores',
+        'schedule': crontab(minute='*/5'),
+    },
+    # Сверка счетчиков отметок interested/going (ежедневно в 3:30)
+    'reconcile-interaction-counts': {
+        'task': 'apps.events.tasks.reconcile_interaction_counts',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    # Пересборка индекса похожих мероприятий (ежедневно в 0:15)
+    'rebuild-event-similarity': {
+        'task': 'apps.events.tasks.rebuild_event_similarity',
+        'schedule': crontab(hour=0, minute=15),
+    },
+    # Пересчет похожих для измененных мероприятий (ежеминутно)
+    'refresh-event-similarity': {
+        'task': 'apps.events.tasks.refresh_event_similarity',
+        'schedule': crontab(minute='*'),
+    },
+    # Пересчет рекомендаций после сверки отметок (ежедневно в 4:00)
+    'rebuild-recommendations': {
+        'task': 'apps.events.tasks.rebuild_recommendations',
+        'schedule': crontab(hour=4, minute=0),
+    },
 }
 
 @app.task(bind=True)
@@ -16,6 +16,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     
     # Third party
     'rest_framework',
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'utils.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -126,7 +128,18 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.renderers.ORJSONRenderer',
+        'utils.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'utils.renderers.ORJSONParser',
+        'utils.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
 }
 
@@ -180,12 +193,41 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
+# Redis для счетчиков и кэша
+REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/1')
+
+# Буферизация счетчика просмотров в Redis (False — синхронная запись в БД)
+EVENT_VIEWS_BUFFERED = config('EVENT_VIEWS_BUFFERED', default=True, cast=bool)
+
+# Кэш
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+}
+
+# Время жизни кэша списков мероприятий для анонимных пользователей (секунды)
+EVENT_LIST_CACHE_TIMEOUT = config('EVENT_LIST_CACHE_TIMEOUT', default=300, cast=int)
+
+# Cache-Control max-age для детальной страницы мероприятия и категорий (секунды)
+EVENT_DETAIL_MAX_AGE = config('EVENT_DETAIL_MAX_AGE', default=60, cast=int)
+CATEGORY_MAX_AGE = config('CATEGORY_MAX_AGE', default=300, cast=int)
+
+# Метрики запросов для Prometheus (/metrics); при заданном токене
+# /metrics требует заголовок Authorization: Bearer <token>, без токена
+# доступен только при DEBUG
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 # Yandex Afisha API
 YANDEX_AFISHA_API_KEY = config('YANDEX_AFISHA_API_KEY', default='')
 
 # Security settings (production)
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
+    # Проверка работоспособности и сбор метрик идут по HTTP внутри сети
+    SECURE_REDIRECT_EXEMPT = [r'^healthz$', r'^metrics$']
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
     SECURE_BROWSER_XSS_FILTER = True
@@ -6,6 +6,7 @@ from rest_framework import routers
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from utils.metrics import healthz_view, metrics_view
 
 from apps.events.views import EventViewSet, CategoryViewSet, UserEventInteractionViewSet
 from apps.reviews.views import ReviewViewSet
@@ -47,6 +48,10 @@ urlpatterns = [
     path('api/v1/auth/registration/', include('dj_rest_auth.registration.urls')),
     path('api/v1/auth/social/', include('allauth.socialaccount.urls')),
     
+    # Проверка работоспособности и метрики Prometheus
+    path('healthz', healthz_view, name='healthz'),
+    path('metrics', metrics_view, name='metrics'),
+    
     # Swagger/OpenAPI документация
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
@@ -0,0 +1,151 @@
+"""
+Выборочные поля ответа: ?fields=id,title и ?omit=description
+
+SparseFieldsetsMixin (сериализатор) убирает из ответа невостребованные
+поля — вычисляемые поля при этом не вычисляются. sparse_queryset сужает
+запрос до колонок, нужных оставшимся полям (only() + select_related только
+нужных связей), поэтому тяжелые колонки вроде description не читаются.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _parse(request, param):
+    if request is None:
+        return None
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def requested_fields(request, available):
+    """
+    Имена полей, которые нужно отдать, или None, если ответ не сужается
+
+    Неизвестные имена игнорируются.
+    """
+    only = _parse(request, FIELDS_PARAM)
+    omit = _parse(request, OMIT_PARAM)
+    if only is None and omit is None:
+        return None
+
+    names = [name for name in available if only is None or name in only]
+    if omit:
+        names = [name for name in names if name not in omit]
+    return names
+
+
+class SparseFieldsetsMixin:
+    """
+    Миксин сериализатора для ?fields= / ?omit=
+
+    Применяется только к сериализатору верхнего уровня (в том числе к
+    элементам many=True) и только при чтении (SAFE_METHODS), вложенные
+    сериализаторы не затрагиваются.
+
+    sparse_field_dependencies — колонки модели, которые нужны полям,
+    вычисляемым методами модели, например
+    {'average_rating': ['reviews_count', 'rating_sum']}.
+    """
+
+    sparse_field_dependencies = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_top_level():
+            return fields
+
+        # Запись (POST/PUT/PATCH) валидирует и возвращает все поля
+        request = self.context.get('request')
+        if request is not None and request.method not in SAFE_METHODS:
+            return fields
+
+        names = requested_fields(request, list(fields))
+        if names is None:
+            return fields
+        return {name: fields[name] for name in names}
+
+    def _is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+
+def _model_paths(model, source):
+    """
+    Пути колонок для only() и связи для select_related() по source поля
+
+    Returns:
+        (paths, related) или None, если source не сводится к полям модели
+    """
+    paths = []
+    related = []
+    prefix = ''
+    for attr in source.split('.'):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if field.is_relation and not field.many_to_many and not field.one_to_many:
+            paths.append(prefix + field.name)
+            related.append(prefix + field.name)
+            prefix = f'{prefix}{field.name}__'
+            model = field.related_model
+        elif field.is_relation:
+            return None
+        else:
+            paths.append(prefix + field.name)
+    # Сама связь без атрибута (например, 'category') — только колонка FK
+    if related and paths[-1] == related[-1]:
+        related.pop()
+    return paths, related
+
+
+def sparse_queryset(queryset, serializer_class, request, extra_fields=()):
+    """
+    Сужает queryset до колонок, нужных запрошенным полям сериализатора
+
+    Если какое-то поле нельзя однозначно сопоставить колонкам модели,
+    queryset возвращается без изменений.
+
+    Args:
+        extra_fields: колонки, которые нужны вне сериализатора
+            (например, поля keyset-пагинации)
+    """
+    serializer = serializer_class(context={'request': None})
+    all_fields = serializer.fields
+    names = requested_fields(request, list(all_fields))
+    if names is None:
+        return queryset
+
+    dependencies = getattr(serializer_class, 'sparse_field_dependencies', {})
+    columns = set(extra_fields)
+    related = set()
+    for name in names:
+        if name in dependencies:
+            columns.update(dependencies[name])
+            continue
+
+        field = all_fields[name]
+        if isinstance(field, serializers.SerializerMethodField):
+            continue  # Вычисляется без колонок модели либо объявлен в dependencies
+        if field.source == '*':
+            return queryset
+
+        resolved = _model_paths(queryset.model, field.source)
+        if resolved is None:
+            return queryset
+        paths, relations = resolved
+        columns.update(paths)
+        related.update(relations)
+
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns) if columns else queryset.only('pk')
@@ -0,0 +1,100 @@
+import math
+from django.db.models import F, FloatField
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0
+GEOHASH_PRECISION = 9
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Кодирует координаты в geohash заданной длины"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, rng = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            rng[0] = mid
+        else:
+            bits = bits * 2
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """Размер ячейки geohash в градусах: (по широте, по долготе)"""
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def geohash_cover(min_lat, min_lon, max_lat, max_lon, max_cells=24):
+    """
+    Набор префиксов geohash, покрывающих прямоугольник
+
+    Выбирается максимальная длина префикса, при которой число ячеек не
+    превышает max_cells, поэтому запрос сводится к нескольким диапазонным
+    сканированиям индекса по geohash.
+    """
+    # Границы прижимаются к допустимым координатам: число ячеек конечно
+    min_lat, max_lat = (min(max(value, -90.0), 89.999999) for value in (min_lat, max_lat))
+    min_lon, max_lon = (min(max(value, -180.0), 179.999999) for value in (min_lon, max_lon))
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lon = geohash_cell_size(precision)
+        lat_start = math.floor((min_lat + 90) / cell_lat)
+        lat_end = math.floor((max_lat + 90) / cell_lat)
+        lon_start = math.floor((min_lon + 180) / cell_lon)
+        lon_end = math.floor((max_lon + 180) / cell_lon)
+        if (lat_end - lat_start + 1) * (lon_end - lon_start + 1) <= max_cells:
+            break
+
+    cells = set()
+    for lat_index in range(lat_start, lat_end + 1):
+        for lon_index in range(lon_start, lon_end + 1):
+            cells.add(geohash_encode(
+                (lat_index + 0.5) * cell_lat - 90,
+                (lon_index + 0.5) * cell_lon - 180,
+                precision
+            ))
+    return sorted(cells)
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """Прямоугольник (min_lat, min_lon, max_lat, max_lon), описанный вокруг круга"""
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    delta_lon = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    return (
+        max(latitude - delta_lat, -90.0), max(longitude - delta_lon, -180.0),
+        min(latitude + delta_lat, 90.0), min(longitude + delta_lon, 180.0),
+    )
+
+
+def distance_km_expression(latitude, longitude, lat_field='latitude', lon_field='longitude'):
+    """Выражение ORM для расстояния по формуле гаверсинусов (км)"""
+    lat = Radians(Cast(F(lat_field), FloatField()))
+    lon = Radians(Cast(F(lon_field), FloatField()))
+    origin_lat = math.radians(latitude)
+    origin_lon = math.radians(longitude)
+
+    haversine = (
+        Power(Sin((lat - origin_lat) / 2), 2)
+        + math.cos(origin_lat) * Cos(lat) * Power(Sin((lon - origin_lon) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(haversine))
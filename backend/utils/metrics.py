@@ -0,0 +1,201 @@
+"""
+Метрики запросов API в формате Prometheus
+
+MetricsMiddleware для каждого запроса измеряет время ответа, число и
+время SQL-запросов (обертка connection.execute_wrapper), попадания в кэш
+ответов и размер ответа. Метка view — класс и действие DRF
+(EventViewSet.list, EventViewSet.mark_going) или имя функции. Для
+потоковых ответов (выгрузка) учитывается только работа до начала
+передачи тела.
+
+Значения всех процессов gunicorn копятся в одном хэше Redis (один
+pipeline на запрос), /metrics отдает их в текстовом формате Prometheus.
+Недоступность Redis не влияет на обработку запросов.
+"""
+import time
+from contextvars import ContextVar
+import redis
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import HttpResponse, JsonResponse
+
+METRICS_KEY = 'metrics:http'
+
+# Границы корзин гистограммы времени ответа, секунды
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Пути, которые не учитываются (сами метрики и проверка работоспособности)
+EXCLUDED_PATHS = ('/metrics', '/healthz')
+
+# Метрики текущего запроса (для учета попаданий в кэш из кода view)
+_current = ContextVar('request_metrics', default=None)
+
+_redis_client = None
+
+
+def get_redis():
+    """Клиент Redis для метрик (создается один раз на процесс)"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+def record_cache(result):
+    """Учитывает попадание ('hit') или промах ('miss') кэша в текущем запросе"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics[f'cache_{result}'] += 1
+
+
+def view_label(view_func, method):
+    """EventViewSet.list для действий DRF, иначе модуль.функция"""
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    actions = getattr(view_func, 'actions', None) or {}
+    action = actions.get(method.lower(), method.lower())
+    return f'{cls.__name__}.{action}'
+
+
+class MetricsMiddleware:
+    """Сбор метрик запросов (включается настройкой METRICS_ENABLED)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED or request.path_info.startswith(EXCLUDED_PATHS):
+            return self.get_response(request)
+
+        metrics = {'queries': 0, 'sql_seconds': 0.0, 'cache_hit': 0, 'cache_miss': 0}
+        request._metrics_view = 'unmatched'
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._sql_recorder(metrics)):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - started
+
+        size = 0 if response.streaming else len(response.content)
+        self._store(request._metrics_view, request.method, response.status_code, elapsed, size, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = view_label(view_func, request.method)
+
+    @staticmethod
+    def _sql_recorder(metrics):
+        def recorder(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                metrics['queries'] += 1
+                metrics['sql_seconds'] += time.perf_counter() - started
+        return recorder
+
+    @staticmethod
+    def _store(view, method, status, elapsed, size, metrics):
+        labels = f'{view}|{method}'
+        bucket = next((index for index, bound in enumerate(LATENCY_BUCKETS) if elapsed <= bound), len(LATENCY_BUCKETS))
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hincrby(METRICS_KEY, f'{labels}|status|{status}', 1)
+            pipe.hincrby(METRICS_KEY, f'{labels}|bucket|{bucket}', 1)
+            pipe.hincrbyfloat(METRICS_KEY, f'{labels}|seconds', elapsed)
+            pipe.hincrby(METRICS_KEY, f'{labels}|queries', metrics['queries'])
+            pipe.hincrbyfloat(METRICS_KEY, f'{labels}|sql_seconds', metrics['sql_seconds'])
+            pipe.hincrby(METRICS_KEY, f'{labels}|bytes', size)
+            for result in ('hit', 'miss'):
+                if metrics[f'cache_{result}']:
+                    pipe.hincrby(METRICS_KEY, f'{labels}|cache|{result}', metrics[f'cache_{result}'])
+            pipe.execute()
+        except redis.RedisError:
+            pass  # Метрики не должны влиять на ответ
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render():
+    """Накопленные метрики в текстовом формате Prometheus"""
+    series = {}
+    for field, value in get_redis().hgetall(METRICS_KEY).items():
+        view, method, name, *rest = field.decode().split('|')
+        entry = series.setdefault((view, method), {
+            'status': {}, 'bucket': {}, 'cache': {},
+            'seconds': 0.0, 'queries': 0, 'sql_seconds': 0.0, 'bytes': 0,
+        })
+        value = float(value)
+        if rest:
+            entry[name][rest[0]] = value
+        else:
+            entry[name] = value
+
+    families = {
+        'http_requests_total': ('counter', 'Запросы по view, методу и коду ответа', []),
+        'http_request_duration_seconds': ('histogram', 'Время ответа', []),
+        'http_request_sql_queries_total': ('counter', 'SQL-запросы', []),
+        'http_request_sql_seconds_total': ('counter', 'Время SQL-запросов', []),
+        'http_response_size_bytes_total': ('counter', 'Размер ответов (без потоковых)', []),
+        'http_cache_requests_total': ('counter', 'Обращения к кэшу ответов', []),
+    }
+    for (view, method), entry in sorted(series.items()):
+        labels = f'view="{_escape(view)}",method="{method}"'
+        for status, count in sorted(entry['status'].items()):
+            families['http_requests_total'][2].append(f'{{{labels},status="{status}"}} {count:g}')
+
+        histogram = families['http_request_duration_seconds'][2]
+        cumulative = 0
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            cumulative += entry['bucket'].get(str(index), 0)
+            histogram.append(f'_bucket{{{labels},le="{bound}"}} {cumulative:g}')
+        total = cumulative + entry['bucket'].get(str(len(LATENCY_BUCKETS)), 0)
+        histogram.append(f'_bucket{{{labels},le="+Inf"}} {total:g}')
+        histogram.append(f'_sum{{{labels}}} {entry["seconds"]:.6f}')
+        histogram.append(f'_count{{{labels}}} {total:g}')
+
+        families['http_request_sql_queries_total'][2].append(f'{{{labels}}} {entry["queries"]:g}')
+        families['http_request_sql_seconds_total'][2].append(f'{{{labels}}} {entry["sql_seconds"]:.6f}')
+        families['http_response_size_bytes_total'][2].append(f'{{{labels}}} {entry["bytes"]:g}')
+        for result, count in sorted(entry['cache'].items()):
+            families['http_cache_requests_total'][2].append(f'{{{labels},result="{result}"}} {count:g}')
+
+    lines = []
+    for name, (kind, description, samples) in families.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(f'{name}{sample}' for sample in samples)
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    /metrics: при заданном METRICS_TOKEN — только с Authorization: Bearer <token>
+
+    Без токена метрики открыты только при DEBUG, иначе — 403.
+    """
+    if not settings.METRICS_TOKEN:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif request.headers.get('Authorization') != f'Bearer {settings.METRICS_TOKEN}':
+        return HttpResponse(status=403)
+    try:
+        body = render()
+    except redis.RedisError:
+        return HttpResponse('Redis недоступен\n', status=503, content_type='text/plain; charset=utf-8')
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def healthz_view(request):
+    """Проверка работоспособности: процесс отвечает и база данных доступна"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError:
+        return JsonResponse({'status': 'error', 'database': 'unavailable'}, status=503)
+    return JsonResponse({'status': 'ok'})
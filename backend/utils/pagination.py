@@ -0,0 +1,239 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError as APIValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset, exact_threshold=10000):
+    """
+    Оценка количества строк по статистике планировщика PostgreSQL
+
+    Если оценка меньше exact_threshold, выполняется точный COUNT(*) —
+    для небольших выборок он дешев, а оценка на них наименее точна.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    estimated = int(plan[0]['Plan']['Plan Rows'])
+    if estimated < exact_threshold:
+        return queryset.count()
+    return estimated
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Постраничная навигация с опциональным курсорным режимом
+
+    По умолчанию работает как PageNumberPagination (?page=), но страница
+    выбирается запросом page_size + 1 строк (наличие следующей страницы —
+    по лишней строке), а общее количество в ответе берется из оценки
+    планировщика и только отображается: номера страниц с ней не сверяются,
+    поэтому заниженная оценка не скрывает существующие страницы. Если у view задан
+    keyset_ordering, запрос с параметром ?cursor= переключает на keyset-
+    пагинацию: следующая страница выбирается условием по значениям
+    последней строки, без OFFSET и COUNT(*).
+
+    keyset_ordering — список полей, последнее из которых уникально,
+    например ['start_date', 'start_time', 'id'] или ['-created_at', 'id'].
+    """
+
+    cursor_query_param = 'cursor'
+
+    # Точный COUNT(*), если оценка планировщика меньше
+    exact_count_threshold = 10000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_ordering = getattr(view, 'keyset_ordering', None)
+        self.cursor_mode = bool(
+            self.keyset_ordering and self.cursor_query_param in request.query_params
+        )
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        if not self.cursor_mode:
+            return self.paginate_page_number(queryset, page_size)
+
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+        self.check_ordering(queryset)
+
+        queryset = queryset.order_by(*self.get_keyset_order_by())
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.get_keyset_filter(queryset.model, position))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound('Некорректный курсор')
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def paginate_page_number(self, queryset, page_size):
+        """Страница ?page=N: OFFSET и page_size + 1 строк"""
+        value = self.request.query_params.get(self.page_query_param, 1)
+        try:
+            self.page_number = int(value)
+        except (TypeError, ValueError):
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound('Некорректный номер страницы')
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound('Страница не найдена')
+
+        self.queryset = queryset
+        self.offset = offset
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_count(self):
+        """
+        Количество для ответа: на последней странице — точное, иначе оценка
+        (не меньше уже увиденных строк)
+        """
+        seen = self.offset + len(self.page)
+        if not self.has_next:
+            return seen
+        return max(estimate_count(self.queryset, self.exact_count_threshold), seen + 1)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return Response({
+                'count': self.get_count(),
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            })
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.cursor_mode:
+            url = self.request.build_absolute_uri()
+            return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+        last = self.page[-1]
+        position = [
+            self._dump_value(self._get_value(last, field.lstrip('-')))
+            for field in self.keyset_ordering
+        ]
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position))
+
+    def get_previous_link(self):
+        if self.cursor_mode or self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def check_ordering(self, queryset):
+        """
+        Курсор задает порядок keyset_ordering; другой порядок запроса
+        (?ordering=, релевантность поиска, расстояние) с ним несовместим
+        """
+        query = queryset.query
+        if query.order_by:
+            ordering = list(query.order_by)
+        elif query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+        else:
+            ordering = []
+        if ordering != self.keyset_ordering[:len(ordering)]:
+            raise APIValidationError({
+                self.cursor_query_param: 'Курсор поддерживает только порядок по умолчанию '
+                                         '(без ordering, search и near)'
+            })
+
+    def get_keyset_order_by(self):
+        """Явный порядок NULL, совпадающий с условием get_keyset_filter"""
+        order_by = []
+        for field in self.keyset_ordering:
+            if field.startswith('-'):
+                order_by.append(F(field[1:]).desc(nulls_first=True))
+            else:
+                order_by.append(F(field).asc(nulls_last=True))
+        return order_by
+
+    def get_keyset_filter(self, model, position):
+        """
+        Условие "строго после позиции" для лексикографического порядка
+
+        (a, b, id) > (A, B, ID) раскрывается в
+        a > A OR (a = A AND (b > B OR (b = B AND id > ID)))
+        с учетом того, где в порядке сортировки находятся NULL.
+        """
+        condition = None
+        for field, value in reversed(list(zip(self.keyset_ordering, position))):
+            descending = field.startswith('-')
+            name = field.lstrip('-')
+            model_field = model._meta.get_field(name)
+            value = model_field.to_python(value)
+
+            if value is None:
+                after = Q(**{f'{name}__isnull': False}) if descending else Q(pk__in=[])
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if model_field.null and not descending:
+                    after |= Q(**{f'{name}__isnull': True})
+                equal = Q(**{name: value})
+
+            condition = after if condition is None else after | (equal & condition)
+
+        # Граница по первому полю позволяет планировщику сканировать индекс диапазоном
+        if value is not None and not model_field.null:
+            condition &= Q(**{f'{name}__lte' if descending else f'{name}__gte': value})
+        return condition
+
+    def encode_cursor(self, position):
+        payload = json.dumps(position, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Пустой курсор означает первую страницу"""
+        if not cursor:
+            return None
+        try:
+            payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            position = json.loads(payload)
+        except (TypeError, ValueError):
+            raise NotFound('Некорректный курсор')
+        if not isinstance(position, list) or len(position) != len(self.keyset_ordering):
+            raise NotFound('Некорректный курсор')
+        return position
+
+    @staticmethod
+    def _get_value(row, name):
+        """Значение поля строки: модели или словаря из values()"""
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    @staticmethod
+    def _dump_value(value):
+        if value is None or isinstance(value, (int, str)):
+            return value
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
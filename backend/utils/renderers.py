@@ -0,0 +1,174 @@
+"""
+Рендереры и парсеры API: JSON на orjson и MessagePack
+
+ORJSONRenderer выдает тот же JSON, что и JSONRenderer DRF (компактный,
+UTF-8), но сериализует в несколько раз быстрее. Типы, которых нет в
+orjson (Decimal, ленивые строки, QuerySet и т.п.), а также даты и время
+(DRF обрезает время до миллисекунд) преобразуются так же, как в
+rest_framework.utils.encoders.JSONEncoder; совпадение ответов проверяет
+команда check_list_parity. Если orjson не установлен, используется
+стандартная реализация DRF.
+
+MessagePackRenderer / MessagePackParser отдают и принимают
+application/msgpack — клиент выбирает формат заголовком Accept
+(или ?format=msgpack).
+
+NDJSONRenderer и CSVRenderer предназначены для потоковой выгрузки:
+метод stream() отдает ответ частями, не собирая его в памяти.
+"""
+import csv
+import io
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """
+    Преобразование типов, которые не поддерживаются сериализатором нативно
+    (для MessagePack — в том числе дат и времени: строки ISO 8601, как в JSON)
+    """
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson (отступ из Accept: application/json; indent=N — 2 пробела)"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        # Даты и время — через _default, в формате JSONEncoder DRF
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=_default, option=option)
+        # Как и JSONRenderer, экранируем разделители строк, недопустимые в JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser на orjson"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Ответ в формате MessagePack"""
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if msgpack is None:
+            raise ImproperlyConfigured('Для MessagePackRenderer нужен пакет msgpack')
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True, datetime=False)
+
+
+class MessagePackParser(BaseParser):
+    """Разбор тела запроса в формате MessagePack"""
+
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if msgpack is None:
+            raise ImproperlyConfigured('Для MessagePackParser нужен пакет msgpack')
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON: по объекту на строку"""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+    render_style = 'binary'
+
+    # Объектов в одной части потокового ответа
+    chunk_rows = 500
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return b''.join(self.stream(items))
+
+    def stream(self, items, fields=None):
+        """Части ответа (bytes) по chunk_rows объектов"""
+        json_renderer = ORJSONRenderer()
+        lines = []
+        for item in items:
+            lines.append(json_renderer.render(item))
+            if len(lines) >= self.chunk_rows:
+                yield b'\n'.join(lines) + b'\n'
+                lines = []
+        if lines:
+            yield b'\n'.join(lines) + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV с заголовком; отсутствующие и пустые значения — пустые ячейки"""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    # Строк в одной части потокового ответа
+    chunk_rows = 500
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        fields = list(dict.fromkeys(key for item in items for key in item))
+        return b''.join(self.stream(items, fields))
+
+    def stream(self, items, fields):
+        """Заголовок и строки (bytes) частями по chunk_rows строк"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+
+        rows = 0
+        for item in items:
+            writer.writerow(item)
+            rows += 1
+            if rows >= self.chunk_rows:
+                yield self._flush(buffer)
+                rows = 0
+        yield self._flush(buffer)
+
+    def _flush(self, buffer):
+        chunk = buffer.getvalue().encode(self.charset)
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
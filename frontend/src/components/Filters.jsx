@@ -1,9 +1,18 @@
 import React from 'react';
 import './Filters.css';
 
-function Filters({ categories, filters, onFilterChange, onReset }) {
+function Filters({ categories, facets, filters, onFilterChange, onReset }) {
   const ageRestrictions = ['0+', '6+', '12+', '16+', '18+'];
 
+  // Число мероприятий для значения фильтра (из /events/facets/)
+  const withCount = (label, facet, value) => {
+    if (!facets) {
+      return label;
+    }
+    const item = facets[facet].find(entry => String(entry.value) === String(value));
+    return `${label} (${item ? item.count : 0})`;
+  };
+
   return (
     <div className="filters">
       <h3>Фильтры</h3>
@@ -20,7 +29,7 @@ function Filters({ categories, filters, onFilterChange, onReset }) {
             <option value="">Все категории</option>
             {categories.map(cat => (
               <option key={cat.id} value={cat.slug}>
-                {cat.name}
+                {withCount(cat.name, 'category', cat.slug)}
               </option>
             ))}
           </select>
@@ -69,8 +78,8 @@ function Filters({ categories, filters, onFilterChange, onReset }) {
             onChange={(e) => onFilterChange('is_free', e.target.value)}
           >
             <option value="">Все</option>
-            <option value="true">Бесплатные</option>
-            <option value="false">Платные</option>
+            <option value="true">{withCount('Бесплатные', 'is_free', true)}</option>
+            <option value="false">{withCount('Платные', 'is_free', false)}</option>
           </select>
         </div>
 
@@ -84,7 +93,7 @@ function Filters({ categories, filters, onFilterChange, onReset }) {
           >
             <option value="">Все возрасты</option>
             {ageRestrictions.map(age => (
-              <option key={age} value={age}>{age}</option>
+              <option key={age} value={age}>{withCount(age, 'age_restriction', age)}</option>
             ))}
           </select>
         </div>
@@ -9,6 +9,7 @@ import './HomePage.css';
 function HomePage() {
   const [events, setEvents] = useState([]);
   const [categories, setCategories] = useState([]);
+  const [facets, setFacets] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [showFilters, setShowFilters] = useState(false);
@@ -28,6 +29,7 @@ function HomePage() {
   useEffect(() => {
     fetchCategories();
     fetchEvents();
+    fetchFacets();
   }, [filters]);
 
   const fetchCategories = async () => {
@@ -39,20 +41,30 @@ function HomePage() {
     }
   };
 
+  // Параметры запроса без пустых значений
+  const buildParams = () => Object.entries(filters).reduce((acc, [key, value]) => {
+    if (value !== '') {
+      acc[key] = value;
+    }
+    return acc;
+  }, {});
+
+  const fetchFacets = async () => {
+    try {
+      const { ordering, ...params } = buildParams();
+      const response = await eventsAPI.getFacets(params);
+      setFacets(response.data);
+    } catch (err) {
+      console.error('Ошибка загрузки счетчиков фильтров:', err);
+    }
+  };
+
   const fetchEvents = async () => {
     setLoading(true);
     setError(null);
     
     try {
-      // Формируем параметры запроса, убирая пустые значения
-      const params = Object.entries(filters).reduce((acc, [key, value]) => {
-        if (value !== '') {
-          acc[key] = value;
-        }
-        return acc;
-      }, {});
-
-      const response = await eventsAPI.getAll(params);
+      const response = await eventsAPI.getAll(buildParams());
       setEvents(response.data.results || response.data);
     } catch (err) {
       setError('Ошибка при загрузке мероприятий. Попробуйте позже.');
@@ -108,6 +120,7 @@ function HomePage() {
           <div className="container">
             <Filters
               categories={categories}
+              facets={facets}
               filters={filters}
               onFilterChange={handleFilterChange}
               onReset={handleResetFilters}
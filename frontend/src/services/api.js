@@ -48,6 +48,8 @@ export const eventsAPI = {
   markGoing: (slug) => api.post(`/events/${slug}/mark_going/`),
   getMyEvents: (type) => api.get('/events/my_events/', { params: { type } }),
   getFeatured: () => api.get('/events/featured/'),
+  getMapPoints: (params) => api.get('/events/map/', { params }),
+  getFacets: (params) => api.get('/events/facets/', { params }),
 };
 
 // Categories API